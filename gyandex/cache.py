@@ -0,0 +1,46 @@
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+
+def hash_key(*parts: str) -> str:
+    """Generate a cache key from the given parts."""
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    A content-addressed cache storing one file per key in a directory.
+    """
+
+    def __init__(self, directory: str, suffix: str = ""):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory in which cached entries are stored
+            suffix: File name suffix for the cached entries, e.g. '.mp3'
+        """
+        self.directory = directory
+        self.suffix = suffix
+
+    def path(self, key: str) -> str:
+        """Get the path of the file storing the entry for a key."""
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get the cached entry for a key, or None if it is not cached."""
+        try:
+            with open(self.path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, data: bytes) -> None:
+        """Store the entry for a key, replacing any existing entry atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, self.path(key))
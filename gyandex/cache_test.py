@@ -0,0 +1,30 @@
+from .cache import DiskCache, hash_key
+
+
+def test_disk_cache_round_trip(tmp_path):
+    """Tests that stored entries are returned for their key"""
+    # Given
+    cache = DiskCache(str(tmp_path / "cache"), ".bin")
+
+    # When
+    cache.set("key", b"value")
+
+    # Then
+    assert cache.get("key") == b"value"
+    assert (tmp_path / "cache" / "key.bin").read_bytes() == b"value"
+
+
+def test_disk_cache_miss_returns_none(tmp_path):
+    """Tests that a missing entry is reported as None"""
+    # Given
+    cache = DiskCache(str(tmp_path))
+
+    # When/Then
+    assert cache.get("missing") is None
+
+
+def test_hash_key_separates_parts():
+    """Tests that the key depends on how the parts are split"""
+    # When/Then
+    assert hash_key("ab", "c") == hash_key("ab", "c")
+    assert hash_key("ab", "c") != hash_key("a", "bc")
@@ -1,18 +1,112 @@
 import argparse
 import asyncio
-import hashlib
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, ContextManager, Iterator, List, Optional
 
 from dotenv import load_dotenv
 from rich.console import Console
 
-from gyandex.loaders.factory import load_content
+from gyandex.cache import DiskCache, hash_key
+from gyandex.loaders.factory import Document, load_content
 from gyandex.podgen.config.loader import load_config
+from gyandex.podgen.config.schema import PodcastConfig
 from gyandex.podgen.engine.publisher import PodcastMetadata, PodcastPublisher
 from gyandex.podgen.feed.models import PodcastDB
 from gyandex.podgen.speech.factory import get_text_to_speech_engine
+from gyandex.podgen.speech.google_cloud import GoogleTTSEngine
 from gyandex.podgen.storage.factory import get_storage
+from gyandex.podgen.workflows.alexandria import AlexandriaWorkflow
 from gyandex.podgen.workflows.factory import get_workflow
+from gyandex.podgen.workflows.types import DialogueLine, PodcastEpisode
+
+CONTENT_CACHE_DIR = "assets/content_cache"
+SCRIPT_CACHE_DIR = "assets/script_cache"
+TTS_CACHE_DIR = "assets/tts_cache"
+FEED_CACHE_DIR = "assets/feed_cache"
+
+
+def status(console: Console, message: str) -> ContextManager[Any]:
+    """
+    Show a spinner while a phase of the run is in progress.
+
+    The spinner refreshes at a low rate, since it competes for the GIL with synthesis and audio
+    assembly. Setting GYANDEX_PLAIN_LOG logs the message once instead, e.g. for CI or batch runs.
+    """
+    if os.environ.get("GYANDEX_PLAIN_LOG"):
+        console.log(message)
+        return nullcontext()
+    return console.status(message, refresh_per_second=4)
+
+
+def synthesize_cached_segment(tts_engine: GoogleTTSEngine, dialogue: DialogueLine, cache: DiskCache, key: str) -> bytes:
+    """Synthesize a dialogue line and store the audio in the cache"""
+    audio = tts_engine.process_segment(dialogue)
+    cache.set(key, audio)
+    return audio
+
+
+def synthesize_segments(
+    tts_engine: GoogleTTSEngine, dialogues: List[DialogueLine], concurrency: int, cache: Optional[DiskCache] = None
+) -> Iterator[bytes]:
+    """
+    Synthesize dialogue lines in parallel, yielding the audio in dialogue order.
+
+    Segments are yielded as soon as they are ready, so the consumer can assemble
+    segment N while the following segments are still being synthesized. When a
+    `cache` is given, previously synthesized lines are read from it instead of
+    calling the TTS service again.
+    """
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        futures: List[Future[bytes]] = []
+        for dialogue in dialogues:
+            if cache is None:
+                futures.append(executor.submit(tts_engine.process_segment, dialogue))
+                continue
+
+            key = tts_engine.cache_key(dialogue)
+            audio = cache.get(key)
+            if audio is not None:
+                # Cache hits resolve immediately without occupying a worker
+                future: Future[bytes] = Future()
+                future.set_result(audio)
+                futures.append(future)
+            else:
+                futures.append(executor.submit(synthesize_cached_segment, tts_engine, dialogue, cache, key))
+
+        for future in futures:
+            yield future.result()
+    finally:
+        # Drop the lines that have not started when a segment fails or the consumer stops early,
+        # instead of paying for the rest of the script before the error surfaces
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def generate_script(
+    workflow: AlexandriaWorkflow, config: PodcastConfig, document: Document, cache: Optional[DiskCache] = None
+) -> PodcastEpisode:
+    """Generate the podcast script, reusing the cached script when the inputs are unchanged"""
+    if cache is None:
+        return asyncio.run(workflow.generate_script(document))
+
+    key = hash_key(
+        str(workflow.cache_version),
+        config.workflow.model_dump_json(
+            exclude={"verbose": True, "concurrency": True, "outline": {"api_key"}, "script": {"api_key"}}
+        ),
+        config.tts.model_dump_json(include={"participants"}),
+        document.title,
+        document.content,
+    )
+    cached = cache.get(key)
+    if cached is not None:
+        return PodcastEpisode.model_validate_json(cached)
+
+    script = asyncio.run(workflow.generate_script(document))
+    cache.set(key, script.model_dump_json().encode("utf-8"))
+    return script
 
 
 def main():
@@ -21,6 +115,12 @@ def main():
 
     parser = argparse.ArgumentParser(description="Generate a podcast")
     parser.add_argument("config_path", help="Path to the podcast config file")
+    parser.add_argument(
+        "--fast-writes",
+        action="store_true",
+        help="Switch the podcast database to SQLite's write-ahead log with normal syncing, "
+        "which is faster but can lose the last transactions on a power failure",
+    )
     args = parser.parse_args()
 
     if args.config_path == "--help" or args.config_path == "--version":
@@ -28,51 +128,60 @@ def main():
         return
     console = Console()
     config = load_config(args.config_path)
+    feed_website = str(config.feed.website)
+    feed_image = str(config.feed.image)
+    feed_categories = ",".join(config.feed.categories)
 
     # Load the content
-    with console.status("[bold green] Loading content...[/bold green]"):
-        document = load_content(config.content)
+    with status(console, "[bold green] Loading content...[/bold green]"):
+        document = load_content(config.content, DiskCache(CONTENT_CACHE_DIR, ".json"))
     console.log("Content loaded...")
 
     # Analyze the content
-    with console.status("[bold green] Crafting the script...[/bold green]"):
+    with status(console, "[bold green] Crafting the script...[/bold green]"):
         workflow = get_workflow(config)
-        script = asyncio.run(workflow.generate_script(document))
+        script = generate_script(workflow, config, document, DiskCache(SCRIPT_CACHE_DIR, ".json"))
     console.log(f'Script completed for "{script.title}". Script contains {len(script.dialogues)} segments...')
 
-    # Generate the podcast audio
-    with console.status("[bold green] Generating audio...[/bold green]"):
-        tts_engine = get_text_to_speech_engine(config.tts)
-        audio_segments = [tts_engine.process_segment(dialogue) for dialogue in script.dialogues]
+    tts_engine = get_text_to_speech_engine(config.tts)
+    audio_segments = synthesize_segments(
+        tts_engine, script.dialogues, config.tts.concurrency, DiskCache(TTS_CACHE_DIR, ".mp3")
+    )
+
+    # Create output directory
+    output_dir = f"generated_podcasts/{config.feed.slug}"
+    os.makedirs(output_dir, exist_ok=True)
+    podcast_path = f"{output_dir}/podcast_{config.content.source_key}.mp3"
 
-        # Create output directory
-        output_dir = f"generated_podcasts/{config.feed.slug}"
-        os.makedirs(output_dir, exist_ok=True)
+    # Generate the podcast audio in the background, and set up the feed in the meantime
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with status(console, "[bold green] Generating audio...[/bold green]"):
+            audio_file = executor.submit(tts_engine.generate_audio_file, audio_segments, podcast_path)
 
-        podcast_path = f"{output_dir}/podcast_{hashlib.md5(config.content.source.encode()).hexdigest()}.mp3"
-        tts_engine.generate_audio_file(audio_segments, podcast_path)
+            storage = get_storage(config.storage)
+            db = PodcastDB(db_path="assets/podcasts.db", fast_writes=args.fast_writes)
+            publisher = PodcastPublisher(
+                storage=storage,
+                db=db,
+                # @FIXME: we need to fallback when custom domain is not available
+                base_url=f"https://{storage.custom_domain}",
+                feed_cache=DiskCache(FEED_CACHE_DIR, ".etag"),
+            )
+            publisher.create_feed(
+                slug=config.feed.slug,
+                title=config.feed.title,
+                email=config.feed.email,
+                website=feed_website,
+                description=config.feed.description,
+                author=config.feed.author,
+                image_url=feed_image,
+                language=config.feed.language,
+                categories=feed_categories,
+            )
+            audio_file.result()
     console.log(f"Podcast file {podcast_path} generated...")
 
-    with console.status("[bold green] Publishing podcast...[/bold green]"):
-        storage = get_storage(config.storage)
-        db = PodcastDB(db_path="assets/podcasts.db")
-        publisher = PodcastPublisher(
-            storage=storage,
-            db=db,
-            # @FIXME: we need to fallback when custom domain is not available
-            base_url=f"https://{storage.custom_domain}",
-        )
-        publisher.create_feed(
-            slug=config.feed.slug,
-            title=config.feed.title,
-            email=config.feed.email,
-            website=str(config.feed.website),
-            description=config.feed.description,
-            author=config.feed.author,
-            image_url=str(config.feed.image),
-            language=config.feed.language,
-            categories=",".join(config.feed.categories),
-        )
+    with status(console, "[bold green] Publishing podcast...[/bold green]"):
         console.log("Uploading episode...")
         urls = publisher.add_episode(
             feed_slug=config.feed.slug,
@@ -1,8 +1,20 @@
-from unittest.mock import Mock, patch
+import threading
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from gyandex.cli.podgen import main
+from gyandex.cache import DiskCache
+from gyandex.cli.podgen import generate_script, main, status, synthesize_segments
+from gyandex.loaders.factory import Document
+from gyandex.podgen.config.schema import (
+    AlexandriaWorkflowConfig,
+    Gender,
+    GoogleCloudTTSConfig,
+    GoogleGenerativeAILLMConfig,
+    Participant,
+    PodcastConfig,
+)
+from gyandex.podgen.workflows.types import DialogueLine, PodcastEpisode
 
 
 def test_cli_help_command():
@@ -29,3 +41,133 @@ def test_invalid_config_path():
         patch("argparse.ArgumentParser.parse_args", return_value=Mock(config_path=invalid_path)),
     ):
         main()
+
+
+def test_synthesize_segments_preserves_dialogue_order():
+    """Tests that parallel synthesis returns audio in the same order as the dialogues"""
+    # Given
+    dialogues = [DialogueLine(speaker="HOST1", text=f"line {i}") for i in range(10)]
+    tts_engine = Mock()
+    tts_engine.process_segment.side_effect = lambda dialogue: dialogue.text.encode()
+
+    # When
+    audio_segments = list(synthesize_segments(tts_engine, dialogues, concurrency=4))
+
+    # Then
+    assert audio_segments == [f"line {i}".encode() for i in range(10)]
+    assert tts_engine.process_segment.call_count == 10
+
+
+def test_synthesize_segments_stops_after_a_failed_segment():
+    """Tests that a failing dialogue line cancels the lines that have not been synthesized yet"""
+    # Given
+    dialogues = [DialogueLine(speaker="HOST1", text=f"line {i}") for i in range(100)]
+    release = threading.Event()
+
+    def process_segment(dialogue):
+        if dialogue.text == "line 0":
+            raise RuntimeError("synthesis failed")
+        # Keep the other workers busy until the failure has been handled
+        release.wait(timeout=1)
+        return dialogue.text.encode()
+
+    tts_engine = Mock()
+    tts_engine.process_segment.side_effect = process_segment
+
+    # When
+    with pytest.raises(RuntimeError):
+        list(synthesize_segments(tts_engine, dialogues, concurrency=2))
+    release.set()
+
+    # Then
+    assert tts_engine.process_segment.call_count <= 3
+
+
+def test_synthesize_segments_stops_when_abandoned():
+    """Tests that closing the generator early cancels the lines that have not been synthesized yet"""
+    # Given
+    dialogues = [DialogueLine(speaker="HOST1", text=f"line {i}") for i in range(100)]
+    release = threading.Event()
+
+    def process_segment(dialogue):
+        if dialogue.text != "line 0":
+            release.wait(timeout=1)
+        return dialogue.text.encode()
+
+    tts_engine = Mock()
+    tts_engine.process_segment.side_effect = process_segment
+    audio_segments = synthesize_segments(tts_engine, dialogues, concurrency=2)
+
+    # When
+    assert next(audio_segments) == b"line 0"
+    audio_segments.close()
+    release.set()
+
+    # Then
+    assert tts_engine.process_segment.call_count <= 3
+
+
+def test_synthesize_segments_reuses_cached_audio(tmp_path):
+    """Tests that previously synthesized dialogue lines are served from the cache"""
+    # Given
+    dialogues = [DialogueLine(speaker="HOST1", text="hello"), DialogueLine(speaker="HOST2", text="world")]
+    tts_engine = Mock()
+    tts_engine.cache_key.side_effect = lambda dialogue: f"{dialogue.speaker}-{dialogue.text}"
+    tts_engine.process_segment.side_effect = lambda dialogue: dialogue.text.encode()
+    cache = DiskCache(str(tmp_path), ".mp3")
+    _ = list(synthesize_segments(tts_engine, dialogues, concurrency=2, cache=cache))
+    tts_engine.process_segment.reset_mock()
+
+    # When
+    audio_segments = list(synthesize_segments(tts_engine, dialogues, concurrency=2, cache=cache))
+
+    # Then
+    assert audio_segments == [b"hello", b"world"]
+    tts_engine.process_segment.assert_not_called()
+
+
+def test_generate_script_reuses_cached_script(tmp_path):
+    """Tests that a script generated for the same document and workflow config is served from the cache"""
+    # Given
+    llm_config = GoogleGenerativeAILLMConfig(provider="google-generative-ai", model="gemini-pro", api_key="test-key")
+    config = PodcastConfig.model_construct(
+        workflow=AlexandriaWorkflowConfig(name="alexandria", outline=llm_config, script=llm_config),
+        tts=GoogleCloudTTSConfig(
+            provider="google-cloud",
+            participants=[Participant(name="HOST1", voice="en-US-Neural2-F", gender=Gender.FEMALE)],
+        ),
+    )
+    document = Document(title="title", content="test content")
+    script = PodcastEpisode(
+        title="title", description="description", dialogues=[DialogueLine(speaker="HOST1", text="hello")]
+    )
+    workflow = Mock(cache_version=1)
+    workflow.generate_script = AsyncMock(return_value=script)
+    cache = DiskCache(str(tmp_path), ".json")
+    _ = generate_script(workflow, config, document, cache)
+
+    # When
+    result = generate_script(workflow, config, document, cache)
+
+    # Then
+    assert result == script
+    workflow.generate_script.assert_awaited_once()
+
+    # And a changed title, which is part of the outline prompt, is not served from the cache
+    _ = generate_script(workflow, config, Document(title="new title", content="test content"), cache)
+    assert workflow.generate_script.await_count == 2
+
+
+def test_status_logs_once_in_plain_mode(monkeypatch):
+    """Tests that GYANDEX_PLAIN_LOG replaces the live spinner with a single log line"""
+    # Given
+    monkeypatch.setenv("GYANDEX_PLAIN_LOG", "1")
+    console = Mock()
+
+    # When
+    with status(console, "Working..."):
+        pass
+
+    # Then
+    console.log.assert_called_once_with("Working...")
+    console.status.assert_not_called()
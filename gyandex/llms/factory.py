@@ -1,29 +1,44 @@
+import functools
 import logging
 import os
 from datetime import datetime
+from typing import Any, Callable, Dict
 
 from langchain_core.callbacks import BaseCallbackHandler
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI
+from langchain_core.language_models import BaseChatModel
 
-from ..podgen.config.schema import LLMConfig  # @TODO: Pull this out of podgen
+from ..podgen.config.schema import (  # @TODO: Pull this out of podgen
+    GoogleGenerativeAILLMConfig,
+    LLMConfig,
+    OpenAILLMConfig,
+)
+
+
+@functools.lru_cache(maxsize=None)
+def get_llm_log_handler(log_dir: str) -> logging.FileHandler:
+    """Get the file handler for a log directory, creating it once per process"""
+    os.makedirs(log_dir, exist_ok=True)
+    # Create file handler with timestamp in filename
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    fh = logging.FileHandler(f"{log_dir}/llm_logs_{timestamp}.log")
+    fh.setLevel(logging.INFO)
+
+    # Create formatter
+    formatter = logging.Formatter("%(asctime)s - %(message)s")
+    fh.setFormatter(formatter)
+    return fh
 
 
 class LLMLoggingCallback(BaseCallbackHandler):
     def __init__(self, log_dir="assets"):
         logger = logging.getLogger("llm_logger")
         logger.setLevel(logging.INFO)
-        os.makedirs(log_dir, exist_ok=True)
-        # Create file handler with timestamp in filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        fh = logging.FileHandler(f"{log_dir}/llm_logs_{timestamp}.log")
-        fh.setLevel(logging.INFO)
+        logger.propagate = False
 
-        # Create formatter
-        formatter = logging.Formatter("%(asctime)s - %(message)s")
-        fh.setFormatter(formatter)
-
-        logger.addHandler(fh)
+        # Every model shares the logger, so attach the handler only once
+        fh = get_llm_log_handler(log_dir)
+        if fh not in logger.handlers:
+            logger.addHandler(fh)
         self.logger = logger
 
     def on_llm_start(self, serialized, prompts, **kwargs):
@@ -40,23 +55,40 @@ class LLMLoggingCallback(BaseCallbackHandler):
         self.logger.error(f"\n=== ERROR ===\n{str(error)}\n")
 
 
+# Provider integrations are imported lazily, since each of them is slow to import and a run uses only a few
+def build_google_generative_ai(config: GoogleGenerativeAILLMConfig, callback: LLMLoggingCallback) -> BaseChatModel:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model=config.model,
+        temperature=config.temperature,
+        google_api_key=config.api_key,  # pyright: ignore [reportCallIssue]
+        max_output_tokens=8192,  # @TODO: Move this to config params  # pyright: ignore [reportCallIssue]
+        callbacks=[callback],
+    )
+
+
+def build_openai(config: OpenAILLMConfig, callback: LLMLoggingCallback) -> BaseChatModel:
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=config.model,  # pyright: ignore [reportCallIssue]
+        temperature=config.temperature,
+        openai_api_key=config.api_key,  # pyright: ignore [reportCallIssue]
+        base_url=config.base_url,  # pyright: ignore [reportCallIssue]
+        callbacks=[callback],
+    )
+
+
+MODEL_BUILDERS: Dict[str, Callable[[Any, LLMLoggingCallback], BaseChatModel]] = {
+    "google-generative-ai": build_google_generative_ai,
+    "openai": build_openai,
+}
+
+
 # @TODO: Centralize this argument type in a single place
-def get_model(config: LLMConfig, log_dir="assets"):
-    if config.provider == "google-generative-ai":
-        return ChatGoogleGenerativeAI(
-            model=config.model,
-            temperature=config.temperature,
-            google_api_key=config.api_key,  # pyright: ignore [reportCallIssue]
-            max_output_tokens=8192,  # @TODO: Move this to config params  # pyright: ignore [reportCallIssue]
-            callbacks=[LLMLoggingCallback(log_dir)],
-        )
-    elif config.provider == "openai":
-        return ChatOpenAI(
-            model=config.model,  # pyright: ignore [reportCallIssue]
-            temperature=config.temperature,
-            openai_api_key=config.api_key,  # pyright: ignore [reportCallIssue]
-            base_url=config.base_url,  # pyright: ignore [reportCallIssue]
-            callbacks=[LLMLoggingCallback(log_dir)],
-        )
-    else:
+def get_model(config: LLMConfig, log_dir="assets") -> BaseChatModel:
+    builder = MODEL_BUILDERS.get(config.provider)
+    if builder is None:
         raise NotImplementedError(f"Provider {config.provider} not implemented")
+    return builder(config, LLMLoggingCallback(log_dir))
@@ -1,3 +1,5 @@
+import logging
+
 import pytest
 from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import ValidationError
@@ -27,3 +29,29 @@ def test_get_model_raises_for_unsupported_provider():
     # When/Then
     with pytest.raises(ValidationError):
         _ = GoogleGenerativeAILLMConfig(provider="unsupported", model="test", temperature=0.5, api_key="test-key")
+
+
+def test_get_model_reuses_log_handler():
+    """Tests that creating several models does not attach duplicate log handlers"""
+    # Given
+    config = GoogleGenerativeAILLMConfig(
+        provider="google-generative-ai", model="gemini-pro", temperature=0.7, api_key="test-key"
+    )
+
+    # When
+    get_model(config, "/tmp")
+    get_model(config, "/tmp")
+
+    # Then
+    handlers = [h for h in logging.getLogger("llm_logger").handlers if isinstance(h, logging.FileHandler)]
+    assert len([h for h in handlers if h.baseFilename.startswith("/tmp/")]) == 1
+
+
+def test_get_model_raises_for_unknown_provider():
+    """Tests that get_model raises NotImplementedError for providers without a builder"""
+    # Given
+    config = GoogleGenerativeAILLMConfig.model_construct(provider="unsupported", model="test", api_key="test-key")
+
+    # When/Then
+    with pytest.raises(NotImplementedError, match="Provider unsupported not implemented"):
+        get_model(config, "/tmp")
@@ -1,10 +1,18 @@
 from typing import Any, Dict, Optional
 
+import orjson
 import requests
 from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 
+from ..cache import DiskCache, hash_key
 from ..podgen.config.schema import ContentConfig, ContentFormat  # @TODO: Pull this out of podgen
 
+# Shared across fetches so that repeated requests reuse keep-alive connections
+session = requests.Session()
+session.headers.update({"Accept": "application/json"})
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 # @TODO: pull this out of this file
 class Document(BaseModel):
@@ -13,18 +21,33 @@ class Document(BaseModel):
     content: str
 
 
-def load_content(content_config: ContentConfig) -> Document:
+def load_content(content_config: ContentConfig, cache: Optional[DiskCache] = None) -> Document:
     if content_config.format != ContentFormat.HTML:
         raise NotImplementedError(f"Unsupported content format: {content_config.format}")
-    return fetch_url(content_config.source)
+    return fetch_url(content_config.source, cache)
+
+
+def fetch_url(url, cache: Optional[DiskCache] = None) -> Document:
+    """
+    Fetch a URL as a document, optionally caching the result.
 
+    Args:
+        url: URL of the content to load
+        cache: Optional cache in which fetched documents are stored by URL
 
-def fetch_url(url) -> Document:
-    headers = {"Accept": "application/json"}
-    response = requests.get(f"https://r.jina.ai/{url}", headers=headers)
+    Returns:
+        Document with the parsed content of the URL
+    """
+    key = hash_key(url)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return Document.model_validate_json(cached)
+
+    response = session.get(f"https://r.jina.ai/{url}")
     # @TODO: Add error handling
-    content = response.json()
-    return Document(
+    content = orjson.loads(response.content)
+    document = Document(
         title=content["data"]["title"],
         content=content["data"]["content"],
         metadata={
@@ -32,3 +55,8 @@ def fetch_url(url) -> Document:
             "description": content["data"]["description"],
         },
     )
+
+    if cache is not None:
+        cache.set(key, document.model_dump_json().encode("utf-8"))
+
+    return document
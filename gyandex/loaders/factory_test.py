@@ -1,5 +1,6 @@
 import responses
 
+from ..cache import DiskCache
 from .factory import fetch_url
 
 
@@ -58,3 +59,25 @@ def test_fetch_url_constructs_correct_url():
 
     # Then
     assert responses.calls[0].request.url == expected_url
+
+
+@responses.activate
+def test_fetch_url_reuses_cached_document(tmp_path):
+    """Tests that fetch_url serves a previously fetched URL from the cache"""
+    # Given
+    test_url = "test123"
+    responses.add(
+        responses.GET,
+        f"https://r.jina.ai/{test_url}",
+        json={"data": {"title": "title", "content": "test content", "url": "url", "description": "description"}},
+        status=200,
+    )
+    cache = DiskCache(str(tmp_path), ".json")
+    first = fetch_url(test_url, cache)
+
+    # When
+    second = fetch_url(test_url, cache)
+
+    # Then
+    assert second == first
+    assert len(responses.calls) == 1
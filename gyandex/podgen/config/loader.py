@@ -1,46 +1,79 @@
+import functools
 import os
 import re
+from typing import Tuple
 
 import yaml
 
 from .schema import PodcastConfig
 
+# Prefer the libyaml backed loader, PyYAML may be built without it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+ENV_VAR_PATTERN = re.compile(r"\${([^}^{]+)}")
+
+
+def get_env_var(match: re.Match) -> str:
+    """Get the value of the environment variable referenced by a ${ENV_VAR} match"""
+    env_var = match.group(1)
+    env_value = os.environ.get(env_var)
+    if env_value is None:
+        raise ValueError(f"Environment variable {env_var} not found")
+    return env_value
+
 
 def resolve_env_vars(value: str) -> str:
     """Resolve ${ENV_VAR} patterns in string values"""
-    if not isinstance(value, str):
+    # Most values do not reference any environment variable, so skip the regex for them
+    if not isinstance(value, str) or "$" not in value:
         return value
 
-    pattern = r"\${([^}^{]+)}"
-    matches = re.finditer(pattern, value)
-
-    for match in matches:
-        env_var = match.group(1)
-        env_value = os.environ.get(env_var)
-        if env_value is None:
-            raise ValueError(f"Environment variable {env_var} not found")
-        value = value.replace(match.group(0), env_value)
-
-    return value
+    # Substitute all matches in a single pass, instead of rescanning the string for every match
+    return ENV_VAR_PATTERN.sub(get_env_var, value)
 
 
 def resolve_nested_env_vars(data):
-    """Recursively resolve environment variables in nested structures"""
-    if isinstance(data, dict):
-        return {k: resolve_nested_env_vars(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [resolve_nested_env_vars(v) for v in data]
-    else:
+    """Resolve environment variables in nested structures, updating dicts and lists in place"""
+    if not isinstance(data, (dict, list)):
         return resolve_env_vars(data)
 
+    # Walk the structure with an explicit stack, so deeply nested configs do not hit the recursion limit
+    stack = [data]
+    # YAML aliases share a single container, which must only be resolved once,
+    # or the values substituted into it would be expanded again
+    seen = {id(data)}
+    while stack:
+        container = stack.pop()
+        items = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, value in items:
+            if isinstance(value, (dict, list)):
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    stack.append(value)
+            else:
+                container[key] = resolve_env_vars(value)
+    return data
 
-def load_config(config_path: str) -> PodcastConfig:
-    """Load and parse YAML config with environment variable support"""
+
+@functools.lru_cache(maxsize=8)
+def load_cached_config(
+    config_path: str, mtime_ns: int, size: int, environ: Tuple[Tuple[str, str], ...]
+) -> PodcastConfig:
+    """Load and parse a YAML config, memoized on the file's stat and the environment it was resolved with"""
     with open(config_path) as f:
-        config_dict = yaml.safe_load(f)
+        config_dict = yaml.load(f, Loader=SafeLoader)
 
     # Resolve any environment variables in the config
     config_dict = resolve_nested_env_vars(config_dict)
 
-    # Parse with Pydantic
-    return PodcastConfig(**config_dict)  # pyright: ignore [reportCallIssue]
+    # Parse with Pydantic, handing the dict straight to the compiled validator
+    return PodcastConfig.model_validate(config_dict)
+
+
+def load_config(config_path: str) -> PodcastConfig:
+    """Load and parse YAML config with environment variable support"""
+    st = os.stat(config_path)
+    return load_cached_config(config_path, st.st_mtime_ns, st.st_size, tuple(sorted(os.environ.items())))
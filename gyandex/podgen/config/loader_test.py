@@ -1,6 +1,7 @@
 import os
 
 import pytest
+import yaml
 
 from .loader import load_config, resolve_env_vars, resolve_nested_env_vars
 from .schema import PodcastConfig
@@ -33,6 +34,20 @@ def test_resolve_env_vars_handles_multiple_variables():
     assert result == "first_middle_second"
 
 
+def test_resolve_env_vars_does_not_expand_substituted_values():
+    """Test that resolve_env_vars does not resolve patterns inside substituted values"""
+    # Given
+    os.environ["OUTER_VAR"] = "${INNER_VAR}"
+    os.environ["INNER_VAR"] = "inner"
+    input_string = "${OUTER_VAR}"
+
+    # When
+    result = resolve_env_vars(input_string)
+
+    # Then
+    assert result == "${INNER_VAR}"
+
+
 def test_resolve_env_vars_raises_on_missing_variable():
     """Test that resolve_env_vars raises ValueError when environment variable is not found"""
     # Given
@@ -56,6 +71,38 @@ def test_resolve_nested_env_vars_handles_dict():
     assert result == {"key1": "value", "key2": {"nested_key": "value"}}
 
 
+def test_resolve_nested_env_vars_handles_deeply_nested_lists():
+    """Test that resolve_nested_env_vars resolves variables nested deeper than the recursion limit"""
+    # Given
+    os.environ["NESTED_VAR"] = "value"
+    depth = 5000
+    input_list = ["${NESTED_VAR}"]
+    for _ in range(depth):
+        input_list = [input_list]
+
+    # When
+    result = resolve_nested_env_vars(input_list)
+
+    # Then
+    for _ in range(depth):
+        result = result[0]
+    assert result == ["value"]
+
+
+def test_resolve_nested_env_vars_resolves_yaml_aliases_once():
+    """Test that a mapping shared through a YAML anchor and alias is only resolved once"""
+    # Given
+    os.environ["ALIASED_VAR"] = "${OTHER_VAR}"
+    os.environ["OTHER_VAR"] = "leak"
+    input_dict = yaml.safe_load("outline: &llm\n  key: ${ALIASED_VAR}\nscript: *llm\n")
+
+    # When
+    result = resolve_nested_env_vars(input_dict)
+
+    # Then
+    assert result == {"outline": {"key": "${OTHER_VAR}"}, "script": {"key": "${OTHER_VAR}"}}
+
+
 def test_load_config_parses_yaml_with_env_vars(tmp_path):
     """Test that load_config properly loads YAML and resolves environment variables"""
     # Given
@@ -141,3 +188,24 @@ def test_load_config_parses_yaml_with_env_vars(tmp_path):
     # Then
     assert isinstance(config, PodcastConfig)
     assert config.feed.title == "My Podcast"
+
+
+def test_load_config_reuses_config_until_file_changes(tmp_path, monkeypatch):
+    """Test that load_config only parses a config again once its file changes"""
+    # Given
+    parsed = []
+    monkeypatch.setattr(PodcastConfig, "model_validate", lambda data: parsed.append(data) or data)
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("version: '1.0'")
+
+    # When
+    first = load_config(str(config_file))
+    second = load_config(str(config_file))
+    config_file.write_text("version: '2.0'")
+    os.utime(config_file, ns=(0, 0))
+    third = load_config(str(config_file))
+
+    # Then
+    assert first is second
+    assert third == {"version": "2.0"}
+    assert len(parsed) == 2
@@ -1,5 +1,7 @@
+import hashlib
 from enum import Enum
-from typing import List, Literal, Optional, TypeAlias, Union
+from functools import cached_property
+from typing import Annotated, List, Literal, Optional, TypeAlias, Union
 
 from pydantic import BaseModel, Field, HttpUrl
 
@@ -17,6 +19,11 @@ class ContentConfig(BaseModel):
     source: str
     format: ContentFormat
 
+    @cached_property
+    def source_key(self) -> str:
+        """Short, stable key identifying the source, e.g. for file names"""
+        return hashlib.blake2b(self.source.encode(), digest_size=8).hexdigest()
+
 
 class LLMProviders(Enum):
     GOOGLE_GENERATIVE_AI = "google-generative-ai"
@@ -38,14 +45,19 @@ class OpenAILLMConfig(BaseModel):
     base_url: Optional[str] = None
 
 
-LLMConfig: TypeAlias = Union[GoogleGenerativeAILLMConfig, OpenAILLMConfig]
+# Tagged unions, so that pydantic picks the model by its tag instead of trying each one in turn
+LLMConfig: TypeAlias = Annotated[Union[GoogleGenerativeAILLMConfig, OpenAILLMConfig], Field(discriminator="provider")]
 
 
 class AlexandriaWorkflowConfig(BaseModel):
     name: Literal["alexandria"]
-    outline: LLMConfig = Field(discriminator="provider")
-    script: LLMConfig = Field(discriminator="provider")
+    outline: LLMConfig
+    script: LLMConfig
     verbose: Optional[bool] = False
+    concurrency: int = Field(default=4, gt=0, description="Number of script segments generated in parallel")
+
+
+WorkflowConfig: TypeAlias = Annotated[Union[AlexandriaWorkflowConfig], Field(discriminator="name")]  # pyright: ignore [reportInvalidTypeArguments]
 
 
 class Gender(Enum):
@@ -65,6 +77,10 @@ class Participant(BaseModel):
 class GoogleCloudTTSConfig(BaseModel):
     provider: Literal["google-cloud"]
     participants: List[Participant]
+    concurrency: int = Field(default=3, gt=0, description="Number of segments synthesized in parallel")
+
+
+TTSConfig: TypeAlias = Annotated[Union[GoogleCloudTTSConfig], Field(discriminator="provider")]  # pyright: ignore [reportInvalidTypeArguments]
 
 
 class S3StorageConfig(BaseModel):
@@ -77,6 +93,9 @@ class S3StorageConfig(BaseModel):
     custom_domain: Optional[str] = None
 
 
+StorageConfig: TypeAlias = Annotated[Union[S3StorageConfig], Field(discriminator="provider")]  # pyright: ignore [reportInvalidTypeArguments]
+
+
 class FeedConfig(BaseModel):
     title: str
     slug: str
@@ -102,7 +121,7 @@ class ContentStructure(BaseModel):
 class PodcastConfig(BaseModel):
     version: str
     content: ContentConfig
-    workflow: Union[AlexandriaWorkflowConfig] = Field(discriminator="name")  # pyright: ignore [reportInvalidTypeArguments]
-    tts: Union[GoogleCloudTTSConfig] = Field(discriminator="provider")  # pyright: ignore [reportInvalidTypeArguments]
-    storage: Union[S3StorageConfig] = Field(discriminator="provider")  # pyright: ignore [reportInvalidTypeArguments]
+    workflow: WorkflowConfig
+    tts: TTSConfig
+    storage: StorageConfig
     feed: FeedConfig
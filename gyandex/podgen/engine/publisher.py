@@ -1,20 +1,26 @@
 import hashlib
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Optional, Sequence
+from itertools import repeat
+from typing import BinaryIO, Dict, List, Optional, Protocol, Sequence, Tuple, TypedDict
 from urllib.parse import urljoin
 
-import mutagen
-
+from ...cache import DiskCache, hash_key
 from ..feed.generator import PodcastFeedGenerator
 from ..feed.models import Episode, PodcastDB
 from ..storage.s3 import S3CompatibleStorage
 
+# Number of episodes ingested and uploaded at once when adding several episodes
+UPLOAD_CONCURRENCY = 4
+HASH_CHUNK_SIZE = 1024 * 1024
+
 
 # @TODO: Look at URL manipulation and how URLs are used between storage
 #   and feeds. There is possibly some duplication here.
-@dataclass
+@dataclass(slots=True)
 class PodcastMetadata:
     title: str
     description: str
@@ -25,6 +31,47 @@ class PodcastMetadata:
     publication_date: Optional[datetime] = None
 
 
+@dataclass(slots=True)
+class AudioFacts:
+    guid: str
+    file_size: int
+    duration: Optional[int] = None
+    mime_type: Optional[str] = "audio/mpeg"
+
+
+class PublishedEpisodes(TypedDict):
+    """URLs of a batch of published episodes and of the feed listing them."""
+
+    episode_urls: List[str]
+    feed_url: str
+
+
+class Digest(Protocol):
+    """The part of a hashlib hash object that HashingReader needs."""
+
+    def update(self, data: memoryview, /) -> None: ...
+
+    def hexdigest(self) -> str: ...
+
+
+class HashingReader(io.RawIOBase):
+    """
+    A read-only, non-seekable stream that feeds everything read through it to a hash.
+    """
+
+    def __init__(self, raw: BinaryIO, digest: Digest):
+        self.raw = raw
+        self.digest = digest
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = self.raw.readinto(buffer)  # pyright: ignore [reportAttributeAccessIssue]
+        self.digest.update(memoryview(buffer)[:size])
+        return size
+
+
 class PodcastPublisher:
     def __init__(
         self,
@@ -33,6 +80,7 @@ class PodcastPublisher:
         base_url: str,
         audio_prefix: str = "episodes",
         feed_prefix: str = "feeds",
+        feed_cache: Optional[DiskCache] = None,
     ):
         """
         Initialize the podcast orchestrator.
@@ -43,6 +91,7 @@ class PodcastPublisher:
             base_url: Base URL for generating public URLs
             audio_prefix: Prefix for audio files in storage
             feed_prefix: Prefix for feed files in storage
+            feed_cache: Optional cache of the ETags each feed version was published with
         """
         self.storage = storage
         self.db = db
@@ -50,24 +99,47 @@ class PodcastPublisher:
         self.audio_prefix = audio_prefix.strip("/")
         self.feed_prefix = feed_prefix.strip("/")
         self.feed_generator = PodcastFeedGenerator(db)
+        self.feed_cache = feed_cache
 
-    def _get_audio_metadata(self, file_path: str) -> Dict[str, Any]:
-        """Extract metadata from audio file."""
-        audio = mutagen.File(file_path)  # pyright: ignore [reportPrivateImportUsage]
-        metadata = {}
+    def _publish_audio(
+        self, feed_slug: str, file_path: str, storage_path: str, metadata: Dict[str, str]
+    ) -> Tuple[AudioFacts, str]:
+        """
+        Extract metadata from audio file, upload it and generate its GUID, reading the file only once.
 
-        if audio is not None:
-            metadata["duration"] = int(audio.info.length) if hasattr(audio.info, "length") else None
-            metadata["mime_type"] = audio.mime[0] if hasattr(audio, "mime") and audio.mime else None
+        Args:
+            feed_slug: Name of the feed the audio belongs to
+            file_path: Path to the audio file
+            storage_path: Desired path of the audio file in storage
+            metadata: Metadata to store along with the audio file
 
-        metadata["file_size"] = os.path.getsize(file_path)
-        return metadata
+        Returns:
+            The audio facts, and the public URL of the uploaded audio file
+        """
+        # Only needed when publishing, keep it off the import path of the rest of the package
+        import mutagen
 
-    def _generate_guid(self, feed_slug: str, file_path: str) -> str:
-        """Generate a unique GUID for the episode."""
         with open(file_path, "rb") as f:
-            file_hash = hashlib.md5(f.read()).hexdigest()
-        return f"{feed_slug}-{file_hash}"
+            file_size = os.fstat(f.fileno()).st_size
+
+            # mutagen only reads the headers it needs, so the probe is cheap before reading the full file
+            audio = mutagen.File(f)  # pyright: ignore [reportPrivateImportUsage]
+            facts = AudioFacts(guid="", file_size=file_size)
+            if audio is not None:
+                facts.duration = int(audio.info.length) if hasattr(audio.info, "length") else None
+                facts.mime_type = audio.mime[0] if hasattr(audio, "mime") and audio.mime else None
+
+            # Hash the file while it is being uploaded, so that it is only read from disk once
+            f.seek(0)
+            reader = HashingReader(f, hashlib.blake2b(digest_size=16))
+            audio_url = self.storage.upload_fileobj(reader, destination_path=storage_path, metadata=metadata)
+            # Hash anything the upload has left unread, so the GUID always covers the full file
+            while reader.read(HASH_CHUNK_SIZE):
+                pass
+
+        # The algorithm tag keeps these apart from the MD5 based GUIDs of earlier episodes
+        facts.guid = f"{feed_slug}-b2-{reader.digest.hexdigest()}"
+        return facts, audio_url
 
     def add_episode(self, feed_slug: str, audio_file_path: str, metadata: PodcastMetadata) -> Dict[str, str]:
         """
@@ -81,63 +153,99 @@ class PodcastPublisher:
         Returns:
             Dictionary containing the episode and feed URLs
         """
+        urls = self.add_episodes(feed_slug, [(audio_file_path, metadata)])
+        return {"episode_url": urls["episode_urls"][0], "feed_url": urls["feed_url"]}
+
+    def add_episodes(self, feed_slug: str, episodes: Sequence[Tuple[str, PodcastMetadata]]) -> PublishedEpisodes:
+        """
+        Add several episodes to a feed, regenerating and uploading the feed only once.
+
+        Args:
+            feed_slug: Name of the feed to add the episodes to
+            episodes: Paths to the audio files along with their episode metadata, in publication order
+
+        Returns:
+            Dictionary containing the episode URLs, in the given order, and the feed URL
+        """
         # Ensure feed exists
         feed = self.db.get_feed(feed_slug)
         if not feed:
             raise ValueError(f"Feed '{feed_slug}' not found")
 
-        # Extract audio metadata
-        audio_metadata = self._get_audio_metadata(audio_file_path)
-
-        # Generate file name and storage path
-        file_name = os.path.basename(audio_file_path)
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        storage_path = f"{self.audio_prefix}/{feed_slug}/{file_name}"
-
-        # Upload audio file
-        audio_url = self.storage.upload_file(
-            file_path=audio_file_path,
-            destination_path=storage_path,
-            metadata={
-                "feed_slug": feed_slug,
-                "episode_title": metadata.title,
-                "timestamp": timestamp,
-            },
-        )
 
-        # Add episode to database
-        _ = self.db.add_episode(
-            feed_slug=feed_slug,
-            title=metadata.title,
-            description=metadata.description,
-            audio_url=audio_url,
-            guid=self._generate_guid(feed_slug, audio_file_path),
-            duration=metadata.duration or audio_metadata.get("duration"),
-            episode_type=metadata.episode_type,
-            explicit=metadata.explicit,
-            image_url=metadata.image_url,
-            publication_date=metadata.publication_date or datetime.now(),
-            file_size=audio_metadata["file_size"],
-            mime_type=audio_metadata.get("mime_type", "audio/mpeg"),
+        # Upload the audio files, the episodes can only be recorded once their GUIDs are known
+        with ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY) as executor:
+            published = list(
+                executor.map(
+                    self._publish_audio,
+                    repeat(feed_slug),
+                    [audio_file_path for audio_file_path, _ in episodes],
+                    [f"{self.audio_prefix}/{feed_slug}/{os.path.basename(path)}" for path, _ in episodes],
+                    [
+                        {"feed_slug": feed_slug, "episode_title": metadata.title, "timestamp": timestamp}
+                        for _, metadata in episodes
+                    ],
+                )
+            )
+
+        # Add episodes to database
+        self.db.add_episodes(
+            feed_slug,
+            [
+                {
+                    "title": metadata.title,
+                    "description": metadata.description,
+                    "audio_url": audio_url,
+                    "guid": facts.guid,
+                    "duration": metadata.duration or facts.duration,
+                    "episode_type": metadata.episode_type,
+                    "explicit": metadata.explicit,
+                    "image_url": metadata.image_url,
+                    "publication_date": metadata.publication_date or datetime.now(),
+                    "file_size": facts.file_size,
+                    "mime_type": facts.mime_type,
+                }
+                for (_, metadata), (facts, audio_url) in zip(episodes, published)
+            ],
         )
 
-        # Generate and upload new feed
+        # Generate new feed
+        feed_key = self._feed_cache_key(feed_slug)
         feed_xml = self.feed_generator.generate_feed(feed_slug)
-        feed_path = f"{self.feed_prefix}/{feed_slug}.xml"
-        feed_url = self.storage.upload_file(
-            file_path=self._save_temp_feed(feed_xml),
-            destination_path=feed_path,
-            content_type="application/rss+xml",
-        )
 
-        return {"episode_url": audio_url, "feed_url": feed_url}
+        # Upload new feed
+        feed_url = self._upload_feed(feed_slug, feed_xml, feed_key)
 
-    def _save_temp_feed(self, feed_content: str) -> str:
-        """Save feed XML to a temporary file."""
-        temp_path = f"/tmp/feed-{datetime.now().timestamp()}.xml"
-        with open(temp_path, "w", encoding="utf-8") as f:
-            f.write(feed_content)
-        return temp_path
+        return {"episode_urls": [audio_url for _, audio_url in published], "feed_url": feed_url}
+
+    def _feed_cache_key(self, feed_slug: str) -> str:
+        """Get the cache key of the current version of a feed at its storage destination."""
+        feed_url = self.storage.get_public_url(f"{self.feed_prefix}/{feed_slug}.xml")
+        return hash_key(feed_url, self.db.get_feed_version(feed_slug))
+
+    def _is_feed_published(self, feed_slug: str, feed_key: str) -> bool:
+        """Check whether this version of a feed is the one currently in storage."""
+        if self.feed_cache is None:
+            return False
+        feed_etag = self.feed_cache.get(feed_key)
+        if feed_etag is None:
+            return False
+        # The remote feed may have been deleted or overwritten since it was published from here
+        return self.storage.get_etag(f"{self.feed_prefix}/{feed_slug}.xml") == feed_etag.decode("ascii")
+
+    def _upload_feed(self, feed_slug: str, feed_xml: str, feed_key: str) -> str:
+        """Upload feed XML to storage, and remember the ETag this version of the feed was published with."""
+        feed_data = feed_xml.encode("utf-8")
+        feed_url = self.storage.upload_bytes(
+            data=feed_data,
+            destination_path=f"{self.feed_prefix}/{feed_slug}.xml",
+            content_type="application/rss+xml",
+        )
+        if self.feed_cache is not None:
+            # The ETag of an object uploaded in a single part is the MD5 of its content
+            self.feed_cache.set(feed_key, hashlib.md5(feed_data).hexdigest().encode("ascii"))
+        return feed_url
 
     def create_feed(self, slug: str, title: str, description: str, author: str, email: str, **kwargs) -> str:
         """
@@ -155,29 +263,29 @@ class PodcastPublisher:
             Feed URL
         """
         # Get or create feed in database
-        feed = self.db.get_feed(slug)
-        if feed is None:
-            feed = self.db.create_feed(
-                slug=slug,
-                title=title,
-                description=description,
-                author=author,
-                email=email,
-                **kwargs,
-            )
+        with self.db.unit_of_work() as session:
+            feed = self.db.get_feed(slug, session=session)
+            if feed is None:
+                feed = self.db.create_feed(
+                    slug=slug,
+                    title=title,
+                    description=description,
+                    author=author,
+                    email=email,
+                    session=session,
+                    **kwargs,
+                )
+
+        # Skip regenerating and uploading a feed that has not changed since it was last published
+        feed_key = self._feed_cache_key(slug)
+        if self._is_feed_published(slug, feed_key):
+            return self.storage.get_public_url(f"{self.feed_prefix}/{slug}.xml")
 
         # Generate initial empty feed
         feed_xml = self.feed_generator.generate_feed(slug)
-        feed_path = f"{self.feed_prefix}/{slug}.xml"
 
         # Upload feed
-        feed_url = self.storage.upload_file(
-            file_path=self._save_temp_feed(feed_xml),
-            destination_path=feed_path,
-            content_type="application/rss+xml",
-        )
-
-        return feed_url
+        return self._upload_feed(slug, feed_xml, feed_key)
 
     def get_feed_url(self, feed_slug: str) -> str:
         """Get the URL for a feed."""
@@ -1,6 +1,9 @@
+import hashlib
+
 import pytest
 
-from .publisher import PodcastMetadata
+from ...cache import DiskCache
+from .publisher import PodcastMetadata, PodcastPublisher
 
 
 def test_create_feed(orchestrator, mock_storage):
@@ -18,17 +21,96 @@ def test_create_feed(orchestrator, mock_storage):
         "email": "test@example.com",
         "website": "https://example.com",
     }
-    mock_storage.upload_file.return_value = "https://example.com/feeds/test-feed.xml"
+    mock_storage.upload_bytes.return_value = "https://example.com/feeds/test-feed.xml"
 
     # When
     feed_url = orchestrator.create_feed(**feed_data)
 
     # Then
     assert feed_url == "https://example.com/feeds/test-feed.xml"
-    mock_storage.upload_file.assert_called_once()
+    mock_storage.upload_bytes.assert_called_once()
     assert orchestrator.db.get_feed("test-feed") is not None
 
 
+def published_feed_storage(mock_storage):
+    """Make the mock storage report the ETag of the last uploaded content as S3 would, the MD5 of its bytes"""
+    etags = {}
+
+    def upload_bytes(data, destination_path, content_type=None, metadata=None):
+        etags[destination_path] = hashlib.md5(data).hexdigest()
+        return f"https://example.com/{destination_path}"
+
+    mock_storage.upload_bytes.side_effect = upload_bytes
+    mock_storage.get_etag.side_effect = etags.get
+    return etags
+
+
+def test_create_feed_skips_unchanged_feed(mock_storage, test_db, tmp_path):
+    """
+    Given: A feed that has already been published with a feed cache
+    When: Creating the same feed again
+    Then: The feed should not be uploaded a second time
+    """
+    # Given
+    published_feed_storage(mock_storage)
+    publisher = PodcastPublisher(
+        storage=mock_storage,
+        db=test_db,
+        base_url="https://example.com",
+        feed_cache=DiskCache(str(tmp_path), ".etag"),
+    )
+    feed_data = {
+        "slug": "test-feed",
+        "title": "Test Feed",
+        "description": "Test Description",
+        "author": "Test Author",
+        "email": "test@example.com",
+        "website": "https://example.com",
+    }
+    publisher.create_feed(**feed_data)
+    mock_storage.upload_bytes.reset_mock()
+
+    # When
+    feed_url = publisher.create_feed(**feed_data)
+
+    # Then
+    assert feed_url == "https://example.com/feeds/test-feed.xml"
+    mock_storage.upload_bytes.assert_not_called()
+
+
+def test_create_feed_republishes_feed_missing_from_storage(mock_storage, test_db, tmp_path):
+    """
+    Given: A feed that has been published with a feed cache, and then deleted from storage
+    When: Creating the same feed again
+    Then: The feed should be uploaded again
+    """
+    # Given
+    etags = published_feed_storage(mock_storage)
+    publisher = PodcastPublisher(
+        storage=mock_storage,
+        db=test_db,
+        base_url="https://example.com",
+        feed_cache=DiskCache(str(tmp_path), ".etag"),
+    )
+    feed_data = {
+        "slug": "test-feed",
+        "title": "Test Feed",
+        "description": "Test Description",
+        "author": "Test Author",
+        "email": "test@example.com",
+        "website": "https://example.com",
+    }
+    publisher.create_feed(**feed_data)
+    etags.clear()
+    mock_storage.upload_bytes.reset_mock()
+
+    # When
+    publisher.create_feed(**feed_data)
+
+    # Then
+    mock_storage.upload_bytes.assert_called_once()
+
+
 def test_add_episode(orchestrator, mock_storage, sample_audio, mock_mutagen):
     """
     Given: An existing feed and episode metadata
@@ -45,17 +127,15 @@ def test_add_episode(orchestrator, mock_storage, sample_audio, mock_mutagen):
         website="https://example.com",
     )
     # Reset the mock after create_feed
-    mock_storage.upload_file.reset_mock()
+    mock_storage.upload_bytes.reset_mock()
 
     metadata = PodcastMetadata(
         title="Test Episode",
         description="Test Episode Description",
     )
 
-    mock_storage.upload_file.side_effect = [
-        "https://example.com/episodes/test.mp3",
-        "https://example.com/feeds/test-feed.xml",
-    ]
+    mock_storage.upload_fileobj.return_value = "https://example.com/episodes/test.mp3"
+    mock_storage.upload_bytes.return_value = "https://example.com/feeds/test-feed.xml"
 
     # When
     result = orchestrator.add_episode("test-feed", sample_audio, metadata)
@@ -63,7 +143,67 @@ def test_add_episode(orchestrator, mock_storage, sample_audio, mock_mutagen):
     # Then
     assert result["episode_url"] == "https://example.com/episodes/test.mp3"
     assert result["feed_url"] == "https://example.com/feeds/test-feed.xml"
-    assert len(mock_storage.upload_file.call_args_list) == 2
+    mock_storage.upload_fileobj.assert_called_once()
+    mock_storage.upload_bytes.assert_called_once()
+
+
+def test_add_episodes_uploads_feed_once(orchestrator, mock_storage, tmp_path, mock_mutagen):
+    """
+    Given: An existing feed and several audio files
+    When: Adding them as episodes at once
+    Then: Every audio file should be uploaded, and the feed only once
+    """
+    # Given
+    orchestrator.create_feed(
+        slug="test-feed",
+        title="Test Feed",
+        description="Test Description",
+        author="Test Author",
+        email="test@example.com",
+        website="https://example.com",
+    )
+    mock_storage.upload_bytes.reset_mock()
+    mock_storage.upload_fileobj.side_effect = lambda fileobj, destination_path, metadata: destination_path
+    episodes = []
+    for index in range(3):
+        audio_path = tmp_path / f"episode{index}.mp3"
+        audio_path.write_bytes(f"episode{index} content".encode())
+        episodes.append((str(audio_path), PodcastMetadata(title=f"Episode {index}", description="Episode")))
+
+    # When
+    result = orchestrator.add_episodes("test-feed", episodes)
+
+    # Then
+    assert result["episode_urls"] == [f"episodes/test-feed/episode{index}.mp3" for index in range(3)]
+    mock_storage.upload_bytes.assert_called_once()
+    numbers = {episode.title: episode.episode_number for episode in orchestrator.list_episodes("test-feed")}
+    assert numbers == {"Episode 0": 1, "Episode 1": 2, "Episode 2": 3}
+
+
+def test_add_episode_is_not_recorded_when_audio_upload_fails(orchestrator, mock_storage, sample_audio, mock_mutagen):
+    """
+    Given: An existing feed and an audio upload that fails
+    When: Adding a new episode
+    Then: The episode should not be kept and the feed should not be uploaded
+    """
+    # Given
+    orchestrator.create_feed(
+        slug="test-feed",
+        title="Test Feed",
+        description="Test Description",
+        author="Test Author",
+        email="test@example.com",
+        website="https://example.com",
+    )
+    mock_storage.upload_bytes.reset_mock()
+    mock_storage.upload_fileobj.side_effect = RuntimeError("upload failed")
+    metadata = PodcastMetadata(title="Test Episode", description="Test Episode Description")
+
+    # When/Then
+    with pytest.raises(RuntimeError, match="upload failed"):
+        orchestrator.add_episode("test-feed", sample_audio, metadata)
+    assert orchestrator.list_episodes("test-feed") == []
+    mock_storage.upload_bytes.assert_not_called()
 
 
 def test_add_episode_to_nonexistent_feed(orchestrator, sample_audio):
@@ -96,7 +236,7 @@ def test_list_episodes(orchestrator, mock_storage, sample_audio, mock_mutagen):
         website="https://example.com",
     )
 
-    mock_storage.upload_file.return_value = "https://example.com/episodes/test.mp3"
+    mock_storage.upload_fileobj.return_value = "https://example.com/episodes/test.mp3"
 
     # Create two episodes with different content to generate unique GUIDs
     with open(sample_audio, "wb") as f:
@@ -129,3 +269,41 @@ def test_get_feed_url(orchestrator):
 
     # Then
     assert feed_url == "https://example.com/feeds/test-feed.xml"
+
+
+def test_publish_audio(orchestrator, mock_storage, sample_audio, mock_mutagen):
+    """
+    Given: An audio file
+    When: Publishing it
+    Then: It should be uploaded, and the metadata and the GUID derived from the uploaded content returned
+    """
+    # Given
+    uploaded = []
+    mock_storage.upload_fileobj.side_effect = (
+        lambda fileobj, destination_path, metadata: uploaded.append(fileobj.read())
+        or f"https://example.com/{destination_path}"
+    )
+
+    # When
+    facts, audio_url = orchestrator._publish_audio("test-feed", sample_audio, "episodes/test.mp3", {})
+
+    # Then
+    assert uploaded == [b"fake mp3 content"]
+    assert audio_url == "https://example.com/episodes/test.mp3"
+    assert facts.guid == f"test-feed-b2-{hashlib.blake2b(b'fake mp3 content', digest_size=16).hexdigest()}"
+    assert facts.file_size == len(b"fake mp3 content")
+    assert facts.duration == 300
+    assert facts.mime_type == "audio/mpeg"
+
+
+def test_publish_audio_hashes_content_left_unread(orchestrator, sample_audio, mock_mutagen):
+    """
+    Given: An audio file and an upload that does not read it
+    When: Publishing it
+    Then: The GUID should still be derived from the full file content
+    """
+    # When
+    facts, _ = orchestrator._publish_audio("test-feed", sample_audio, "episodes/test.mp3", {})
+
+    # Then
+    assert facts.guid == f"test-feed-b2-{hashlib.blake2b(b'fake mp3 content', digest_size=16).hexdigest()}"
@@ -8,7 +8,9 @@ from .publisher import PodcastPublisher
 
 @pytest.fixture
 def mock_storage():
-    return Mock(spec=S3CompatibleStorage)
+    storage = Mock(spec=S3CompatibleStorage)
+    storage.get_public_url.side_effect = lambda path: f"https://example.com/{path}"
+    return storage
 
 
 @pytest.fixture
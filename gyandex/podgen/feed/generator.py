@@ -1,6 +1,5 @@
-from email.utils import formatdate
+from datetime import timezone
 
-import pytz
 from feedgen.feed import FeedGenerator
 
 from .models import PodcastDB
@@ -53,9 +52,8 @@ class PodcastFeedGenerator:
             fe.title(episode.title)
             fe.description(episode.description)
 
-            # Format the publication date as RFC 2822
-            pub_date = episode.publication_date.replace(tzinfo=pytz.UTC)
-            fe.published(formatdate(float(pub_date.strftime("%s"))))
+            # Publication dates are treated as UTC, feedgen formats aware datetimes as RFC 2822 without reparsing them
+            fe.published(episode.publication_date.replace(tzinfo=timezone.utc))
 
             # Add the audio enclosure
             fe.enclosure(episode.audio_url, str(episode.file_size), episode.mime_type)
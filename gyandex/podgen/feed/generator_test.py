@@ -1,4 +1,6 @@
+import time
 import xml.etree.ElementTree as ET
+from datetime import datetime
 
 import pytest
 
@@ -116,3 +118,26 @@ def test_feed_name_uniqueness(test_db, sample_feed_data):
     # When/Then
     with pytest.raises(Exception):  # SQLite will raise an IntegrityError
         test_db.create_feed(**sample_feed_data)
+
+
+def test_feed_episode_pub_date_ignores_local_timezone(test_db, sample_feed_data, sample_episode_data, monkeypatch):
+    """
+    Given: A feed with an episode and a non-UTC local timezone
+    When: Generating the RSS feed
+    Then: The episode publication date should be formatted as UTC
+    """
+    # Given
+    monkeypatch.setenv("TZ", "Asia/Kolkata")
+    time.tzset()
+    feed = test_db.create_feed(**sample_feed_data)
+    _ = test_db.add_episode(feed.slug, publication_date=datetime(2024, 1, 1, 12, 30), **sample_episode_data)
+
+    # When
+    generator = PodcastFeedGenerator(test_db)
+    feed_xml = generator.generate_feed(feed.slug)
+    monkeypatch.undo()
+    time.tzset()
+
+    # Then
+    item = ET.fromstring(feed_xml).find("channel/item")
+    assert item.find("pubDate").text == "Mon, 01 Jan 2024 12:30:00 +0000"
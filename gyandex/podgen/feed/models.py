@@ -1,15 +1,19 @@
-from typing import Optional, Sequence, Tuple
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     create_engine,
+    event,
+    insert,
 )
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy.orm import Session, contains_eager, declarative_base, relationship, sessionmaker
 from sqlalchemy.sql import func
 
 Base = declarative_base()
@@ -41,21 +45,21 @@ class Feed(Base):
 
     def get_latest_episode(self, session) -> Tuple[int, int]:
         """
-        Get the next episode number for the feed.
+        Get the latest season and episode numbers for the feed.
         """
-        # Query the database to get the maximum episode number for the feed
-        max_episode_number = (
-            session.query(func.max(Episode.episode_number)).filter(Episode.feed_id == self.id).scalar()
-        ) or 0
-
-        max_season_number = (
-            session.query(func.max(Episode.season_number)).filter(Episode.feed_id == self.id).scalar()
-        ) or 1
-        return max_season_number, max_episode_number
+        # Query the database for both maximums at once
+        max_season_number, max_episode_number = (
+            session.query(func.max(Episode.season_number), func.max(Episode.episode_number))
+            .filter(Episode.feed_id == self.id)
+            .one()
+        )
+        return max_season_number or 1, max_episode_number or 0
 
 
 class Episode(Base):
     __tablename__ = "episodes"
+    # Lets episode listings walk a feed's episodes in publication order, instead of sorting them
+    __table_args__ = (Index("ix_episodes_feed_pubdate", "feed_id", "publication_date"),)
 
     id = Column(Integer, primary_key=True)
     feed_id = Column(Integer, ForeignKey("feeds.id"), nullable=False)
@@ -78,55 +82,131 @@ class Episode(Base):
     feed = relationship("Feed", back_populates="episodes")
 
     def __repr__(self):
-        return f"<Episode(title='{self.title}', feed='{self.feed.name}')>"
+        return f"<Episode(title='{self.title}', feed='{self.feed.slug}')>"
+
+
+def configure_sqlite(dbapi_connection, _connection_record):
+    """Tune every new SQLite connection for the write-heavy publishing path"""
+    cursor = dbapi_connection.cursor()
+    # The write-ahead log only syncs on checkpoints, and keeps readers from blocking the writer
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    cursor.close()
 
 
 class PodcastDB:
-    def __init__(self, db_path: str = "podcast.db"):
+    def __init__(self, db_path: str = "podcast.db", fast_writes: bool = False):
+        """
+        Open the podcast database, creating its tables when needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+            fast_writes: Use the write-ahead log with normal syncing, which can lose the last
+                transactions on a power failure. The journal mode is stored in the database file,
+                and SQLite keeps -wal and -shm files next to it, so back those up along with it.
+        """
         self.engine = create_engine(f"sqlite:///{db_path}")
+        if fast_writes:
+            event.listen(self.engine, "connect", configure_sqlite)
         Base.metadata.create_all(self.engine)
-        self.session = sessionmaker(bind=self.engine)
+        # create_all skips existing tables, along with any index added to them since
+        for index in Episode.__table__.indexes:
+            index.create(self.engine, checkfirst=True)
+        # Rows returned by INSERT ... RETURNING are fully loaded, keep them usable after the commit
+        self.session = sessionmaker(bind=self.engine, expire_on_commit=False)
+        # SQLite supports RETURNING from 3.35, the dialect detects it on the first connection
+        self.insert_returning = self.engine.dialect.insert_returning
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[Session]:
+        """
+        Open a session whose operations are committed together when the block exits, or rolled back on an error.
+
+        Pass the session to the methods of this class to run several of them in one transaction.
+        """
+        with self.session.begin() as session:
+            yield session
+
+    def _session_scope(self, session: Optional[Session]) -> ContextManager[Session]:
+        """Use the caller's session, or open one that commits once the operation completes."""
+        return nullcontext(session) if session is not None else self.session.begin()
 
-    def create_feed(self, slug: str, title: str, **kwargs) -> Feed:
-        with self.session() as session:
+    def create_feed(self, slug: str, title: str, session: Optional[Session] = None, **kwargs) -> Feed:
+        with self._session_scope(session) as session:
+            if self.insert_returning:
+                return session.scalars(insert(Feed).values(slug=slug, title=title, **kwargs).returning(Feed)).one()
             feed = Feed(slug=slug, title=title, **kwargs)
             session.add(feed)
-            session.commit()
+            session.flush()
             session.refresh(feed)
             return feed
 
-    def get_feed(self, slug: str) -> Optional[Feed]:
-        with self.session() as session:
+    def get_feed(self, slug: str, session: Optional[Session] = None) -> Optional[Feed]:
+        with self._session_scope(session) as session:
             return session.query(Feed).filter(Feed.slug == slug).first()
 
-    def add_episode(self, feed_slug: str, title: str, audio_url: str, guid: str, **kwargs) -> Episode:
-        with self.session() as session:
+    def add_episode(
+        self, feed_slug: str, title: str, audio_url: str, guid: str, session: Optional[Session] = None, **kwargs
+    ) -> Episode:
+        episode = dict(title=title, audio_url=audio_url, guid=guid, **kwargs)
+        return self.add_episodes(feed_slug, [episode], session=session)[0]
+
+    def add_episodes(
+        self, feed_slug: str, episodes: Sequence[Dict[str, Any]], session: Optional[Session] = None
+    ) -> List[Episode]:
+        """
+        Add several episodes to a feed in a single transaction, numbering them in the given order.
+        """
+        with self._session_scope(session) as session:
             feed = session.query(Feed).filter(Feed.slug == feed_slug).first()
             if not feed:
                 raise ValueError(f"Feed '{feed_slug}' not found")
             season_number, episode_number = feed.get_latest_episode(session)
-            episode = Episode(
-                feed_id=feed.id,
-                title=title,
-                audio_url=audio_url,
-                guid=guid,
-                season_number=season_number,
-                episode_number=episode_number + 1,
-                **kwargs,
+            rows = [
+                dict(
+                    feed_id=feed.id,
+                    season_number=season_number,
+                    episode_number=episode_number + offset,
+                    **episode,
+                )
+                for offset, episode in enumerate(episodes, start=1)
+            ]
+            if self.insert_returning:
+                return list(session.scalars(insert(Episode).returning(Episode, sort_by_parameter_order=True), rows))
+            added = [Episode(**row) for row in rows]
+            session.add_all(added)
+            session.flush()
+            for episode in added:
+                session.refresh(episode)
+            return added
+
+    def get_feed_version(self, slug: str, session: Optional[Session] = None) -> str:
+        """
+        Get a stamp that changes whenever the feed or its list of episodes changes.
+        """
+        with self._session_scope(session) as session:
+            feed = session.query(Feed).filter(Feed.slug == slug).first()
+            if not feed:
+                raise ValueError(f"Feed '{slug}' not found")
+            episode_count, last_episode_id = (
+                session.query(func.count(Episode.id), func.max(Episode.id)).filter(Episode.feed_id == feed.id).one()
             )
-            session.add(episode)
-            session.commit()
-            session.refresh(episode)
-            return episode
+            return f"{feed.updated_at or feed.created_at}:{episode_count}:{last_episode_id}"
 
     # @TODO: Update using the feed id, instead of name
-    def get_episodes(self, feed_slug: str, limit: Optional[int] = None) -> Sequence[Episode]:
-        with self.session() as session:
+    def get_episodes(
+        self, feed_slug: str, limit: Optional[int] = None, session: Optional[Session] = None
+    ) -> Sequence[Episode]:
+        with self._session_scope(session) as session:
             query = (
                 session.query(Episode)
                 .join(Feed)
                 .filter(Feed.slug == feed_slug)
                 .order_by(Episode.publication_date.desc())
+                # Populate the feed from the join, it cannot be lazy loaded once the session is closed
+                .options(contains_eager(Episode.feed))
             )
 
             if limit:
@@ -1,6 +1,7 @@
 import pytest
+from sqlalchemy import event, text
 
-from .models import Feed
+from .models import Feed, PodcastDB
 
 
 # Database Tests
@@ -22,6 +23,68 @@ def test_create_feed(test_db, db_session, sample_feed_data):
     assert stored_feed.created_at is not None
 
 
+def test_database_uses_write_ahead_log_with_fast_writes(tmp_path):
+    """
+    Given: A database opened with fast writes
+    When: Inspecting its connection settings
+    Then: The write-ahead log should be enabled with normal syncing
+    """
+    # Given
+    db = PodcastDB(str(tmp_path / "podcast.db"), fast_writes=True)
+
+    # When
+    with db.session() as session:
+        journal_mode = session.execute(text("PRAGMA journal_mode")).scalar()
+        synchronous = session.execute(text("PRAGMA synchronous")).scalar()
+    db.engine.dispose()
+
+    # Then
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+
+
+def test_database_keeps_sqlite_defaults_without_fast_writes(db_session):
+    """
+    Given: A database opened without fast writes, the default
+    When: Inspecting its connection settings
+    Then: The rollback journal should be kept with full syncing
+    """
+    # When
+    journal_mode = db_session.execute(text("PRAGMA journal_mode")).scalar()
+    synchronous = db_session.execute(text("PRAGMA synchronous")).scalar()
+
+    # Then
+    assert journal_mode == "delete"
+    assert synchronous == 2  # FULL
+
+
+def test_get_episodes_uses_publication_date_index(test_db, db_session, sample_feed_data):
+    """
+    Given: A feed and the query get_episodes runs to list its latest episodes
+    When: Planning that query
+    Then: SQLite should walk the publication date index instead of sorting
+    """
+    # Given
+    feed = test_db.create_feed(**sample_feed_data)
+
+    statements = []
+    event.listen(
+        test_db.engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, parameters, context, executemany: statements.append((statement, parameters)),
+    )
+    test_db.get_episodes(feed.slug, limit=10)
+    statement, parameters = statements[-1]
+
+    # When
+    plan = db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+
+    # Then
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_episodes_feed_pubdate" in details
+    assert "TEMP B-TREE" not in details
+
+
 def test_get_nonexistent_feed(test_db):
     """
     Given: An empty database
@@ -65,6 +128,104 @@ def test_add_episode_to_nonexistent_feed(test_db, sample_episode_data):
         test_db.add_episode(feed_slug="nonexistent", **sample_episode_data)
 
 
+def test_unit_of_work_commits_operations_together(test_db, sample_feed_data, sample_episode_data):
+    """
+    Given: A unit of work
+    When: Creating a feed and adding an episode to it within the unit of work
+    Then: Both should be stored once the unit of work completes
+    """
+    # When
+    with test_db.unit_of_work() as session:
+        feed = test_db.create_feed(**sample_feed_data, session=session)
+        test_db.add_episode(feed_slug=feed.slug, session=session, **sample_episode_data)
+
+    # Then
+    episodes = test_db.get_episodes(feed.slug)
+    assert [episode.guid for episode in episodes] == [sample_episode_data["guid"]]
+
+
+def test_unit_of_work_rolls_back_on_error(test_db, sample_feed_data, sample_episode_data):
+    """
+    Given: A unit of work
+    When: An operation within the unit of work fails
+    Then: None of its operations should be stored
+    """
+    # When
+    with pytest.raises(ValueError):
+        with test_db.unit_of_work() as session:
+            test_db.create_feed(**sample_feed_data, session=session)
+            test_db.add_episode(feed_slug="nonexistent", session=session, **sample_episode_data)
+
+    # Then
+    assert test_db.get_feed(sample_feed_data["slug"]) is None
+
+
+def test_get_feed_version_changes_with_episodes(test_db, sample_feed_data, sample_episode_data):
+    """
+    Given: A feed without episodes
+    When: Adding an episode to it
+    Then: The feed version should change
+    """
+    # Given
+    feed = test_db.create_feed(**sample_feed_data)
+    version = test_db.get_feed_version(feed.slug)
+
+    # When
+    test_db.add_episode(feed_slug=feed.slug, **sample_episode_data)
+
+    # Then
+    assert test_db.get_feed_version(feed.slug) != version
+
+
+def test_add_episodes_numbers_episodes_in_order(test_db, sample_feed_data, sample_episode_data):
+    """
+    Given: A feed with an episode
+    When: Adding several episodes at once
+    Then: The episodes should be numbered after the existing one, in the given order
+    """
+    # Given
+    feed = test_db.create_feed(**sample_feed_data)
+    test_db.add_episode(feed_slug=feed.slug, **sample_episode_data)
+
+    # When
+    episodes = test_db.add_episodes(
+        feed.slug,
+        [{**sample_episode_data, "guid": "episode-2"}, {**sample_episode_data, "guid": "episode-3"}],
+    )
+
+    # Then
+    assert [episode.guid for episode in episodes] == ["episode-2", "episode-3"]
+    assert [episode.episode_number for episode in episodes] == [2, 3]
+
+
+def test_writes_without_insert_returning(test_db, sample_feed_data, sample_episode_data):
+    """
+    Given: A database whose SQLite version predates INSERT ... RETURNING
+    When: Creating a feed and adding episodes to it
+    Then: The same rows should be stored and returned fully loaded
+    """
+    # Given
+    test_db.insert_returning = False
+
+    # When
+    feed = test_db.create_feed(**sample_feed_data)
+    episode = test_db.add_episode(feed_slug=feed.slug, **sample_episode_data)
+    episodes = test_db.add_episodes(
+        feed.slug,
+        [{**sample_episode_data, "guid": "episode-2"}, {**sample_episode_data, "guid": "episode-3"}],
+    )
+
+    # Then
+    assert feed.id is not None
+    assert feed.created_at is not None
+    assert feed.language == "en"
+    assert episode.episode_number == 1
+    assert [episode.guid for episode in episodes] == ["episode-2", "episode-3"]
+    assert [episode.episode_number for episode in episodes] == [2, 3]
+    assert all(episode.created_at is not None and episode.feed_id == feed.id for episode in episodes)
+    assert {episode.guid for episode in test_db.get_episodes(feed.slug)} == {"episode-1", "episode-2", "episode-3"}
+
+
 def test_get_episodes_ordered_by_date(test_db, sample_feed_data, sample_episode_data):
     """
     Given: A feed with multiple episodes
@@ -87,3 +248,21 @@ def test_get_episodes_ordered_by_date(test_db, sample_feed_data, sample_episode_
     # Then
     assert len(episodes) == 2
     assert episodes[0].publication_date >= episodes[1].publication_date
+
+
+def test_get_episodes_loads_their_feed(test_db, sample_feed_data, sample_episode_data):
+    """
+    Given: A feed with an episode
+    When: Getting the episodes of the feed
+    Then: The feed of each episode should be available without a session
+    """
+    # Given
+    feed = test_db.create_feed(**sample_feed_data)
+    test_db.add_episode(feed_slug=feed.slug, **sample_episode_data)
+
+    # When
+    episodes = test_db.get_episodes(feed.slug)
+
+    # Then
+    assert episodes[0].feed.slug == feed.slug
+    assert repr(episodes[0]) == f"<Episode(title='{sample_episode_data['title']}', feed='{feed.slug}')>"
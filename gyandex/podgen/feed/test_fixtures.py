@@ -11,6 +11,8 @@ def test_db():
     db_path = "test_podcast.db"
     db = PodcastDB(db_path)
     yield db
+    # Close the pooled connections before removing the database file
+    db.engine.dispose()
     os.remove(db_path)
 
 
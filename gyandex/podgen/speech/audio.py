@@ -0,0 +1,165 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from typing import BinaryIO, Deque, Iterable, Iterator, List, Optional, cast
+
+import numpy as np
+from pydub import AudioSegment
+
+# NumPy sample types for the sample widths pydub decodes to, keyed by width in bytes
+SAMPLE_TYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+
+def decode_segments(audio_segments: Iterable[bytes], max_workers: Optional[int] = None) -> Iterator[AudioSegment]:
+    """
+    Decode MP3 segments in parallel, yielding them in their original order.
+
+    pydub decodes through an ffmpeg subprocess, so the GIL is released for the duration of the
+    decode and threads are enough to keep several decoders busy. Segments are submitted as they
+    arrive, which keeps decoding pipelined with an iterator that is still being produced.
+
+    Args:
+        audio_segments: MP3 encoded audio segments
+        max_workers: Maximum number of concurrent decoders
+
+    Returns:
+        Iterator over the decoded audio segments
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures: Deque[Future[AudioSegment]] = deque()
+        for segment in audio_segments:
+            futures.append(executor.submit(AudioSegment.from_mp3, BytesIO(segment)))
+            while futures and futures[0].done():
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+    finally:
+        # Drop the pending decodes when a segment fails or the consumer stops early
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def raw_audio(segment: AudioSegment) -> bytes:
+    """Get the raw audio of a segment, which pydub declares as optional but always sets."""
+    return cast(bytes, segment.raw_data)
+
+
+def mix_crossfade(fading_out: AudioSegment, fading_in: AudioSegment) -> bytes:
+    """
+    Crossfade two overlapping stretches of audio with a linear ramp, returning the mixed raw audio.
+
+    The ramp is applied to all samples at once with NumPy, instead of pydub's per-millisecond
+    gain steps. Both stretches must share the same format.
+    """
+    sample_type = SAMPLE_TYPES.get(fading_out.sample_width)
+    if sample_type is None:
+        mixed = fading_out.fade(to_gain=-120, start=0, end=float("inf"))
+        mixed *= fading_in.fade(from_gain=-120, start=0, end=float("inf"))
+        return raw_audio(mixed)
+
+    channels = fading_out.channels
+    outgoing = np.frombuffer(raw_audio(fading_out), dtype=sample_type).reshape(-1, channels)
+    incoming = np.frombuffer(raw_audio(fading_in), dtype=sample_type).reshape(-1, channels)
+    frames = min(len(outgoing), len(incoming))
+
+    # float32 is precise enough for 8 and 16 bit samples, wider samples need float64
+    float_type = np.float32 if fading_out.sample_width <= 2 else np.float64
+    ramp = np.linspace(0.0, 1.0, frames, dtype=float_type)[:, np.newaxis]
+
+    # out * (1 - ramp) + in * ramp, computed as out + (in - out) * ramp in a single buffer
+    mixed = incoming[:frames].astype(float_type)
+    mixed -= outgoing[:frames]
+    mixed *= ramp
+    mixed += outgoing[:frames]
+
+    limits = np.iinfo(sample_type)
+    np.rint(mixed, out=mixed)
+    np.clip(mixed, limits.min, limits.max, out=mixed)
+    return mixed.astype(sample_type).tobytes()
+
+
+def slice_segment(segment: AudioSegment, start: Optional[int], end: Optional[int]) -> AudioSegment:
+    """Slice a segment by milliseconds, pydub's slicing is typed as possibly returning a generator."""
+    return cast(AudioSegment, segment[start:end])
+
+
+def concatenate_segments(segments: Iterable[AudioSegment], crossfade: int = 0) -> AudioSegment:
+    """
+    Concatenate audio segments, crossfading consecutive segments by `crossfade` milliseconds.
+
+    `AudioSegment.append` copies the whole accumulated audio on every call, which makes joining
+    many segments quadratic. Instead, the raw audio of every segment is collected and joined once,
+    and only the overlapping regions are mixed.
+
+    Args:
+        segments: Audio segments to join, in order
+        crossfade: Duration of the crossfade between consecutive segments in milliseconds
+
+    Returns:
+        The combined audio segment
+    """
+    parts: List[bytes] = []
+    first: Optional[AudioSegment] = None
+    # The end of the previous segment is held back until we know how it blends into the next one
+    pending: Optional[AudioSegment] = None
+
+    for segment in segments:
+        if first is None:
+            first = segment
+        else:
+            segment = (
+                segment.set_frame_rate(first.frame_rate)
+                .set_channels(first.channels)
+                .set_sample_width(first.sample_width)
+            )
+
+        if pending is None:
+            pending = segment
+            continue
+
+        overlap = min(crossfade, len(pending), len(segment))
+        if overlap:
+            parts.append(raw_audio(slice_segment(pending, None, -overlap)))
+            parts.append(mix_crossfade(slice_segment(pending, -overlap, None), slice_segment(segment, None, overlap)))
+            pending = slice_segment(segment, overlap, None)
+        else:
+            parts.append(raw_audio(pending))
+            pending = segment
+
+    if first is None or pending is None:
+        return AudioSegment.empty()
+
+    parts.append(raw_audio(pending))
+    return AudioSegment(
+        data=b"".join(parts),
+        sample_width=first.sample_width,
+        frame_rate=first.frame_rate,
+        channels=first.channels,
+    )
+
+
+def strip_id3_tags(data: bytes) -> bytes:
+    """Strip the ID3v2 header and ID3v1 trailer of an MP3 stream, leaving only the audio frames."""
+    if len(data) >= 10 and data[:3] == b"ID3":
+        # The tag size is a 28-bit synchsafe integer that excludes the header and optional footer
+        size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | data[9] & 0x7F
+        has_footer = data[5] & 0x10
+        data = data[10 + size + (10 if has_footer else 0) :]
+    if len(data) >= 128 and data[-128:-125] == b"TAG":
+        data = data[:-128]
+    return data
+
+
+def concatenate_mp3(audio_segments: Iterable[bytes], output: BinaryIO) -> None:
+    """
+    Concatenate MP3 segments by copying their frames, without decoding or re-encoding them.
+
+    MP3 frames are self-contained, so segments encoded with the same settings can be joined
+    back to back once their tags are removed. This only applies when segments are not crossfaded.
+
+    Args:
+        audio_segments: MP3 encoded audio segments
+        output: Binary stream the combined MP3 is written to
+    """
+    for segment in audio_segments:
+        output.write(strip_id3_tags(segment))
@@ -0,0 +1,143 @@
+import math
+import struct
+import threading
+import time
+from io import BytesIO
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from .audio import concatenate_mp3, concatenate_segments, decode_segments, mix_crossfade, strip_id3_tags
+
+
+def make_tone(frequency: int, duration_ms: int, frame_rate: int = 24000) -> AudioSegment:
+    samples = [
+        int(10000 * math.sin(2 * math.pi * frequency * i / frame_rate)) for i in range(frame_rate * duration_ms // 1000)
+    ]
+    return AudioSegment(
+        data=struct.pack(f"<{len(samples)}h", *samples), sample_width=2, frame_rate=frame_rate, channels=1
+    )
+
+
+def test_concatenate_segments_matches_pydub_append():
+    """Tests that concatenation produces the same audio as repeated AudioSegment.append"""
+    # Given
+    segments = [make_tone(220, 500), make_tone(440, 700), make_tone(880, 300)]
+    expected = segments[0]
+    for segment in segments[1:]:
+        expected = expected.append(segment, crossfade=200)
+
+    # When
+    combined = concatenate_segments(segments, crossfade=200)
+
+    # Then
+    # pydub ramps the gain in 1ms steps while the crossfade ramps per sample, so allow a small difference
+    assert len(combined) == len(expected)
+    difference = np.frombuffer(combined.raw_data, np.int16).astype(np.int32) - np.frombuffer(
+        expected.raw_data, np.int16
+    )
+    assert np.abs(difference).max() < 0.01 * 32768
+
+
+def test_mix_crossfade_ramps_linearly():
+    """Tests that the crossfade moves linearly from the outgoing to the incoming audio"""
+    # Given
+    silence = AudioSegment(data=b"\x00\x00" * 5, sample_width=2, frame_rate=1000, channels=1)
+    loud = AudioSegment(data=struct.pack("<5h", *[1000] * 5), sample_width=2, frame_rate=1000, channels=1)
+
+    # When
+    mixed = mix_crossfade(silence, loud)
+
+    # Then
+    assert list(struct.unpack("<5h", mixed)) == [0, 250, 500, 750, 1000]
+
+
+def test_concatenate_segments_without_crossfade():
+    """Tests that segments are joined back to back when no crossfade is requested"""
+    # Given
+    segments = [make_tone(220, 100), make_tone(440, 100)]
+
+    # When
+    combined = concatenate_segments(segments)
+
+    # Then
+    assert combined.raw_data == segments[0].raw_data + segments[1].raw_data
+
+
+def test_concatenate_segments_with_no_segments():
+    """Tests that concatenating nothing yields an empty segment"""
+    # When
+    combined = concatenate_segments([], crossfade=200)
+
+    # Then
+    assert len(combined) == 0
+
+
+def test_decode_segments_preserves_order():
+    """Tests that parallel decoding yields segments in their original order"""
+    # Given
+    tones = {b"first": make_tone(220, 100), b"second": make_tone(440, 100), b"third": make_tone(880, 100)}
+
+    def fake_decode(data):
+        encoded = data.getvalue()
+        # Finish the earlier segments last to exercise out-of-order completion
+        time.sleep(0.05 if encoded == b"first" else 0)
+        return tones[encoded]
+
+    # When
+    with patch.object(AudioSegment, "from_mp3", side_effect=fake_decode):
+        decoded = list(decode_segments(iter(tones.keys()), max_workers=3))
+
+    # Then
+    assert decoded == list(tones.values())
+
+
+def test_decode_segments_stops_after_a_failed_segment():
+    """Tests that a segment failing to decode cancels the decodes that have not started yet"""
+    # Given
+    release = threading.Event()
+    calls = []
+
+    def fake_decode(data):
+        calls.append(data.getvalue())
+        if data.getvalue() == b"0":
+            raise ValueError("invalid MP3")
+        release.wait(timeout=1)
+        return make_tone(220, 10)
+
+    # When
+    with patch.object(AudioSegment, "from_mp3", side_effect=fake_decode):
+        with pytest.raises(ValueError):
+            list(decode_segments((str(i).encode() for i in range(100)), max_workers=2))
+        release.set()
+
+    # Then
+    assert len(calls) <= 3
+
+
+def test_strip_id3_tags_removes_header_and_trailer():
+    """Tests that ID3v2 headers and ID3v1 trailers are removed from MP3 data"""
+    # Given
+    frames = b"\xff\xfb" + b"\x00" * 100
+    header = b"ID3\x04\x00\x00\x00\x00\x00\x05" + b"\x00" * 5
+    trailer = b"TAG" + b"\x00" * 125
+
+    # When/Then
+    assert strip_id3_tags(header + frames + trailer) == frames
+    assert strip_id3_tags(frames) == frames
+
+
+def test_concatenate_mp3_copies_frames():
+    """Tests that MP3 segments are joined by copying their frames"""
+    # Given
+    header = b"ID3\x04\x00\x00\x00\x00\x00\x01" + b"\x00"
+    segments = [header + b"\xff\xfbfirst", header + b"\xff\xfbsecond"]
+    output = BytesIO()
+
+    # When
+    concatenate_mp3(segments, output)
+
+    # Then
+    assert output.getvalue() == b"\xff\xfbfirst\xff\xfbsecond"
@@ -1,11 +1,8 @@
-from typing import Union
-
-from ..config.schema import GoogleCloudTTSConfig
+from ..config.schema import TTSConfig
 from .google_cloud import GoogleTTSEngine
 
 
-# @TODO: Centralize this type and move this to a common place
-def get_text_to_speech_engine(tts_config: Union[GoogleCloudTTSConfig]):  # pyright: ignore [reportInvalidTypeArguments]
+def get_text_to_speech_engine(tts_config: TTSConfig):
     if tts_config.provider == "google-cloud":
         return GoogleTTSEngine(tts_config.participants)
     else:
@@ -1,11 +1,11 @@
-from io import BytesIO
-from typing import Any, Dict, List, Optional
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional
 
 from google.cloud import texttospeech
-from pydub import AudioSegment
 
 from ..config.schema import Gender, Participant
 from ..workflows.types import DialogueLine  # @TODO: Pull this out of workflows
+from .audio import concatenate_mp3, concatenate_segments, decode_segments
 
 
 class GoogleTTSEngine:
@@ -15,6 +15,11 @@ class GoogleTTSEngine:
         self.audio_config = texttospeech.AudioConfig(
             audio_encoding=texttospeech.AudioEncoding.MP3, effects_profile_id=["headphone-class-device"]
         )
+        # Requests only differ by their text, so prebuild one per speaker instead of assembling them on every call
+        self.request_templates = {
+            speaker: texttospeech.SynthesizeSpeechRequest(voice=voice, audio_config=self.audio_config)
+            for speaker, voice in self.voices.items()
+        }
 
     def generate_voice_profile(self, participants: List[Participant]) -> Dict[str, Any]:
         def resolve_gender(gender: Gender):
@@ -33,18 +38,28 @@ class GoogleTTSEngine:
             for participant in participants
         }
 
+    def cache_key(self, segment: DialogueLine) -> str:
+        """Generate a key identifying the audio synthesized for a segment."""
+        digest = hashlib.sha256()
+        digest.update(texttospeech.VoiceSelectionParams.serialize(self.voices[segment.speaker]))
+        digest.update(b"\0")
+        digest.update(texttospeech.AudioConfig.serialize(self.audio_config))
+        digest.update(b"\0")
+        digest.update(segment.text.encode("utf-8"))
+        return digest.hexdigest()
+
     def process_segment(self, segment: DialogueLine) -> bytes:
         return self.synthesize_speech(segment.text, segment.speaker)
 
     def synthesize_speech(self, text: str, speaker: str) -> bytes:
-        synthesis_input = texttospeech.SynthesisInput(text=text)
-        response = self.client.synthesize_speech(
-            input=synthesis_input, voice=self.voices[speaker], audio_config=self.audio_config
-        )
+        # Constructing from the template copies it, so the template itself is never modified
+        request = texttospeech.SynthesizeSpeechRequest(self.request_templates[speaker])
+        request.input.text = text
+        response = self.client.synthesize_speech(request=request)
         return response.audio_content
 
     def generate_audio_file(
-        self, audio_segments: List[bytes], podcast_path: str, options: Optional[Dict[str, Any]] = None
+        self, audio_segments: Iterable[bytes], podcast_path: str, options: Optional[Dict[str, Any]] = None
     ):
         if options is None:
             # @TODO: Fix this code-smell
@@ -52,15 +67,13 @@ class GoogleTTSEngine:
                 "crossfade": 200,
             }
 
-        combined = AudioSegment.empty()
-        previous_segment = None
-        for segment in audio_segments:
-            segment_audio = AudioSegment.from_mp3(BytesIO(segment))
-            if previous_segment:
-                combined = combined.append(segment_audio, crossfade=options["crossfade"])
-            else:
-                combined += segment_audio
-            previous_segment = segment
+        if not options["crossfade"]:
+            # Without a crossfade the MP3 frames can be copied as-is, skipping the decode and re-encode
+            with open(podcast_path, "wb") as f:
+                concatenate_mp3(audio_segments, f)
+            return
+
+        combined = concatenate_segments(decode_segments(audio_segments), crossfade=options["crossfade"])
 
         # Save final podcast
         combined.export(podcast_path, format="mp3")
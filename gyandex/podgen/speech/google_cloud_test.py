@@ -37,7 +37,11 @@ def test_synthesize_speech_for_host1(mock_client):
 
     # Then
     assert result == b"test_audio_content"
-    mock_client.return_value.synthesize_speech.assert_called_once()
+    request = mock_client.return_value.synthesize_speech.call_args.kwargs["request"]
+    assert request.input.text == "Test text"
+    assert request.voice == engine.voices["HOST1"]
+    assert request.audio_config == engine.audio_config
+    assert engine.request_templates["HOST1"].input.text == ""
 
 
 @patch("google.cloud.texttospeech.TextToSpeechClient")
@@ -55,3 +59,40 @@ def test_process_segment(mock_client):
 
     # Then
     assert result == b"test_audio_content"
+
+
+@patch("google.cloud.texttospeech.TextToSpeechClient")
+def test_cache_key_depends_on_voice_and_text(mock_client):
+    """Tests that the cache key changes with the segment voice and text"""
+    # Given
+    participants = [
+        Participant(name="HOST1", language_code="en-US", voice="en-US-Neural2-F", gender=Gender.FEMALE),
+        Participant(name="HOST2", language_code="en-US", voice="en-US-Neural2-D", gender=Gender.MALE),
+    ]
+    engine = GoogleTTSEngine(participants=participants)
+
+    # When
+    key = engine.cache_key(DialogueLine(text="Test segment", speaker="HOST1"))
+
+    # Then
+    assert key == engine.cache_key(DialogueLine(text="Test segment", speaker="HOST1"))
+    assert key != engine.cache_key(DialogueLine(text="Test segment", speaker="HOST2"))
+    assert key != engine.cache_key(DialogueLine(text="Other segment", speaker="HOST1"))
+
+
+@patch("google.cloud.texttospeech.TextToSpeechClient")
+def test_process_segment_reuses_client(mock_client):
+    """Tests that all segments are synthesized through the client created with the engine"""
+    # Given
+    engine = GoogleTTSEngine(participants=dummy_participants)
+    mock_response = Mock()
+    mock_response.audio_content = b"test_audio_content"
+    mock_client.return_value.synthesize_speech.return_value = mock_response
+
+    # When
+    for speaker in ["HOST1", "HOST2", "HOST1"]:
+        engine.process_segment(DialogueLine(text="Test segment", speaker=speaker))
+
+    # Then
+    mock_client.assert_called_once()
+    assert mock_client.return_value.synthesize_speech.call_count == 3
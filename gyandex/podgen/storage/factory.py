@@ -1,11 +1,8 @@
-from typing import Union
-
-from ..config.schema import S3StorageConfig
+from ..config.schema import StorageConfig
 from ..storage.s3 import S3CompatibleStorage
 
 
-# @TODO: Centralize this type and move this to a common place
-def get_storage(config: Union[S3StorageConfig]) -> S3CompatibleStorage:  # pyright: ignore [reportInvalidTypeArguments]
+def get_storage(config: StorageConfig) -> S3CompatibleStorage:
     if config.provider != "s3":  # @TODO: Move this to a enum
         raise NotImplementedError(f"Unsupported storage provider: {config.provider}")
 
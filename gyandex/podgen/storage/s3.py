@@ -1,9 +1,22 @@
 import mimetypes
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Protocol
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
+from botocore.exceptions import ClientError
+
+# Upload anything larger than this in parallel parts of the same size
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+# Connections shared by all uploads in flight, e.g. several episodes uploaded in parallel parts
+MAX_POOL_CONNECTIONS = 32
+
+
+class Readable(Protocol):
+    """A readable file-like object, which is all boto3 needs to upload from a stream."""
+
+    def read(self, size: int = -1, /) -> bytes: ...
 
 
 class S3CompatibleStorage:
@@ -20,6 +33,8 @@ class S3CompatibleStorage:
         region_name: Optional[str] = "auto",
         custom_domain: Optional[str] = None,
         acl: str = "public-read",
+        multipart_chunk_size: int = MULTIPART_CHUNK_SIZE,
+        max_concurrency: int = 8,
     ):
         """
         Initialize the storage client.
@@ -33,13 +48,21 @@ class S3CompatibleStorage:
             region_name: AWS region or 'auto' for R2
             custom_domain: Optional custom domain for generating public URLs
             acl: Default ACL for uploaded files
+            multipart_chunk_size: Size of the parts large files are uploaded in, in bytes
+            max_concurrency: Maximum number of parts of a file uploaded in parallel
         """
         self.bucket = bucket
         self.custom_domain = custom_domain
         self.acl = acl
 
-        # Configure the S3 client with a generous timeout
-        config = Config(connect_timeout=10, read_timeout=30, retries={"max_attempts": 3})
+        # Configure the S3 client with a generous timeout, and enough connections for several parallel uploads
+        config = Config(
+            connect_timeout=10,
+            read_timeout=30,
+            retries={"max_attempts": 3},
+            tcp_keepalive=True,
+            max_pool_connections=max(MAX_POOL_CONNECTIONS, max_concurrency),
+        )
 
         self.client = boto3.client(
             "s3",
@@ -49,6 +72,12 @@ class S3CompatibleStorage:
             region_name=region_name,
             config=config,
         )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_chunk_size,
+            multipart_chunksize=multipart_chunk_size,
+            max_concurrency=max_concurrency,
+            use_threads=True,
+        )
 
     def upload_file(
         self,
@@ -69,8 +98,90 @@ class S3CompatibleStorage:
         Returns:
             Public URL of the uploaded file
         """
+        extra_args = self._get_extra_args(file_path, metadata, content_type)
+
+        self.client.upload_file(
+            file_path, self.bucket, destination_path, ExtraArgs=extra_args, Config=self.transfer_config
+        )
+
+        return self.get_public_url(destination_path)
+
+    def upload_fileobj(
+        self,
+        fileobj: Readable,
+        destination_path: str,
+        metadata: Optional[Dict[str, str]] = None,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """
+        Upload a readable file-like object to storage and return its public URL.
+
+        Args:
+            fileobj: File-like object to read the content from
+            destination_path: Desired path in the bucket
+            metadata: Optional metadata dictionary
+            content_type: Optional content type, will be guessed from the destination if not provided
+
+        Returns:
+            Public URL of the uploaded content
+        """
+        extra_args = self._get_extra_args(destination_path, metadata, content_type)
+
+        self.client.upload_fileobj(
+            fileobj, self.bucket, destination_path, ExtraArgs=extra_args, Config=self.transfer_config
+        )
+
+        return self.get_public_url(destination_path)
+
+    def upload_bytes(
+        self,
+        data: bytes,
+        destination_path: str,
+        metadata: Optional[Dict[str, str]] = None,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """
+        Upload in-memory content to storage and return its public URL.
+
+        Args:
+            data: Content to upload
+            destination_path: Desired path in the bucket
+            metadata: Optional metadata dictionary
+            content_type: Optional content type, will be guessed from the destination if not provided
+
+        Returns:
+            Public URL of the uploaded content
+        """
+        extra_args = self._get_extra_args(destination_path, metadata, content_type)
+
+        self.client.put_object(Bucket=self.bucket, Key=destination_path, Body=data, **extra_args)
+
+        return self.get_public_url(destination_path)
+
+    def get_etag(self, path: str) -> Optional[str]:
+        """
+        Get the ETag of a file in storage, without downloading it.
+
+        Args:
+            path: Path of the file in the bucket
+
+        Returns:
+            The ETag without its quotes, or None if the file does not exist
+        """
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=path)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return response["ETag"].strip('"')
+
+    def _get_extra_args(
+        self, path: str, metadata: Optional[Dict[str, str]], content_type: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build the extra upload arguments, guessing the content type from the path if not provided."""
         if not content_type:
-            content_type, _ = mimetypes.guess_type(file_path)
+            content_type, _ = mimetypes.guess_type(path)
             if not content_type:
                 content_type = "application/octet-stream"
 
@@ -79,9 +190,7 @@ class S3CompatibleStorage:
         if metadata:
             extra_args["Metadata"] = metadata
 
-        self.client.upload_file(file_path, self.bucket, destination_path, ExtraArgs=extra_args)
-
-        return self.get_public_url(destination_path)
+        return extra_args
 
     def download_file(self, remote_path: str, local_path: str) -> None:
         """
@@ -1,3 +1,4 @@
+from io import BytesIO
 from unittest.mock import ANY, Mock
 
 import pytest
@@ -57,9 +58,61 @@ def test_upload_file(storage, mock_s3_client, tmp_path):
             "ContentType": "audio/mpeg",
             "Metadata": {"episode": "1"},
         },
+        Config=storage.transfer_config,
     )
 
 
+def test_upload_fileobj(storage, mock_s3_client):
+    """Test file object upload functionality"""
+    fileobj = BytesIO(b"test content")
+
+    url = storage.upload_fileobj(fileobj, "episodes/test.mp3", metadata={"episode": "1"})
+
+    mock_s3_client.upload_fileobj.assert_called_once_with(
+        fileobj,
+        "test-bucket",
+        "episodes/test.mp3",
+        ExtraArgs={
+            "ACL": "public-read",
+            "ContentType": "audio/mpeg",
+            "Metadata": {"episode": "1"},
+        },
+        Config=storage.transfer_config,
+    )
+    assert url == "https://test-bucket.s3.us-east-1.amazonaws.com/episodes/test.mp3"
+
+
+def test_upload_bytes(storage, mock_s3_client):
+    """Test in-memory upload functionality"""
+    url = storage.upload_bytes(b"<rss/>", "feeds/test.xml", content_type="application/rss+xml")
+
+    mock_s3_client.put_object.assert_called_once_with(
+        Bucket="test-bucket",
+        Key="feeds/test.xml",
+        Body=b"<rss/>",
+        ACL="public-read",
+        ContentType="application/rss+xml",
+    )
+    assert url == "https://test-bucket.s3.us-east-1.amazonaws.com/feeds/test.xml"
+
+
+def test_get_etag(storage, mock_s3_client):
+    """Test that get_etag returns the unquoted ETag of an existing file"""
+    mock_s3_client.head_object.return_value = {"ETag": '"abc123"'}
+
+    assert storage.get_etag("feeds/test.xml") == "abc123"
+    mock_s3_client.head_object.assert_called_once_with(Bucket="test-bucket", Key="feeds/test.xml")
+
+
+def test_get_etag_of_missing_file(storage, mock_s3_client):
+    """Test that get_etag returns None for a file that does not exist"""
+    mock_s3_client.head_object.side_effect = ClientError(
+        {"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject"
+    )
+
+    assert storage.get_etag("feeds/test.xml") is None
+
+
 def test_download_file(storage, mock_s3_client, tmp_path):
     """Test file download functionality"""
     download_path = tmp_path / "downloaded.mp3"
@@ -150,6 +203,7 @@ def test_upload_file_content_type_guessing(storage, mock_s3_client, tmp_path):
             "test-bucket",
             f"test/{filename}",
             ExtraArgs={"ACL": "public-read", "ContentType": expected_content_type},
+            Config=storage.transfer_config,
         )
 
 
@@ -195,4 +249,30 @@ def test_upload_with_custom_acl(mock_s3_client, tmp_path):
         "test-bucket",
         "test/test.mp3",
         ExtraArgs={"ACL": "private", "ContentType": "audio/mpeg"},
+        Config=storage.transfer_config,
+    )
+
+
+def test_upload_file_uses_multipart_transfers(storage):
+    """Test that large uploads are split into parallel multipart uploads"""
+    assert storage.transfer_config.multipart_threshold == 8 * 1024 * 1024
+    assert storage.transfer_config.multipart_chunksize == 8 * 1024 * 1024
+    assert storage.transfer_config.max_request_concurrency == 8
+    assert storage.transfer_config.use_threads
+
+
+def test_client_config_allows_parallel_uploads(mock_s3_storage):
+    """Test that the client keeps enough connections alive for parallel uploads"""
+    storage = S3CompatibleStorage(
+        bucket="test-bucket",
+        access_key_id="test-key",
+        secret_access_key="test-secret",
+        multipart_chunk_size=16 * 1024 * 1024,
+        max_concurrency=64,
     )
+
+    config = mock_s3_storage.call_args.kwargs["config"]
+    assert config.tcp_keepalive
+    assert config.max_pool_connections == 64
+    assert storage.transfer_config.multipart_chunksize == 16 * 1024 * 1024
+    assert storage.transfer_config.max_request_concurrency == 64
@@ -1,9 +1,11 @@
 import asyncio
+import functools
 from textwrap import dedent
-from typing import List
+from typing import List, Type
 
 from langchain.output_parsers import PydanticOutputParser
 from langchain.prompts import PromptTemplate
+from pydantic import BaseModel
 from rich import print as rprint
 
 from ...llms.factory import get_model
@@ -12,6 +14,12 @@ from ..config.schema import LLMConfig, Participant, PodcastConfig
 from .types import OutlineSegment, PodcastEpisode, PodcastOutline, ScriptSegment
 
 
+@functools.lru_cache(maxsize=None)
+def get_format_instructions(model: Type[BaseModel]) -> str:
+    """Get the output format instructions for a model, which only depend on its JSON schema"""
+    return PydanticOutputParser(pydantic_object=model).get_format_instructions()
+
+
 class OutlineGenerator:
     def __init__(self, config: LLMConfig):
         self.model = get_model(config)
@@ -42,7 +50,7 @@ class OutlineGenerator:
             Make sure each segment has a clear transition to the next topic.
             """),
             input_variables=["content"],
-            partial_variables={"format_instructions": self.parser.get_format_instructions()},
+            partial_variables={"format_instructions": get_format_instructions(PodcastOutline)},
         )
 
     def generate_outline(self, document: Document) -> PodcastOutline:
@@ -53,15 +61,17 @@ class OutlineGenerator:
 
 
 class ScriptGenerator:
-    def __init__(self, config: LLMConfig, participants: List[Participant]):
+    def __init__(self, config: LLMConfig, participants: List[Participant], concurrency: int = 4):
         self.model = get_model(config)
+        # Bounds the LLM calls in flight, so that long outlines stay within the provider's rate limits
+        self.semaphore = asyncio.Semaphore(concurrency)
 
         self.parser = PydanticOutputParser(pydantic_object=ScriptSegment)
 
         self.segment_prompt = PromptTemplate(
             input_variables=["segment_name", "talking_points", "duration", "source_content"],
             partial_variables={
-                "format_instructions": self.parser.get_format_instructions(),
+                "format_instructions": get_format_instructions(ScriptSegment),
                 "host_profiles": "\n".join([self.create_host_profile(participant) for participant in participants]),
             },
             template=dedent("""
@@ -123,16 +133,17 @@ class ScriptGenerator:
         """Generate script for a single segment"""
         position = "opening segment" if is_first else "closing segment" if is_last else "middle segment"
         transition = transition if not is_last else ""
-        result = await self.chain.ainvoke(
-            {
-                "segment_name": segment.name,
-                "talking_points": segment.talking_points,
-                "duration": segment.duration,
-                "source_content": source_content,
-                "position": position,
-                "transition": transition,
-            }
-        )
+        async with self.semaphore:
+            result = await self.chain.ainvoke(
+                {
+                    "segment_name": segment.name,
+                    "talking_points": segment.talking_points,
+                    "duration": segment.duration,
+                    "source_content": source_content,
+                    "position": position,
+                    "transition": transition,
+                }
+            )
         return result
 
     async def generate_full_script(self, outline: PodcastOutline, document_content: str) -> List[ScriptSegment]:
@@ -160,6 +171,8 @@ class ScriptGenerator:
 
 class AlexandriaWorkflow:
     config: PodcastConfig
+    # Bump whenever the prompts change, so that cached scripts are regenerated
+    cache_version = 1
 
     def __init__(self, config: PodcastConfig):
         self.config = config
@@ -167,7 +180,9 @@ class AlexandriaWorkflow:
     async def generate_script(self, document: Document) -> PodcastEpisode:
         # Initialize components
         outline_gen = OutlineGenerator(self.config.workflow.outline)
-        script_gen = ScriptGenerator(self.config.workflow.script, self.config.tts.participants)
+        script_gen = ScriptGenerator(
+            self.config.workflow.script, self.config.tts.participants, self.config.workflow.concurrency
+        )
 
         # Generate outline
         outline = outline_gen.generate_outline(document)
@@ -205,4 +220,5 @@ class AlexandriaWorkflow:
         for segment in script_segments:
             segments += segment.dialogue
         rprint(f"Number of segments: {len(segments)}")
-        return PodcastEpisode(title=outline.title, description=outline.description, dialogues=segments)
+        # The outline and the dialogue lines have already been validated by their parsers
+        return PodcastEpisode.model_construct(title=outline.title, description=outline.description, dialogues=segments)